@@ -0,0 +1,107 @@
+"""
+Load test for the control API against simulated modems.
+
+Usage:
+    python -m benchmarks.bench_api [--endpoint status|sms|inbox] [--clients 20] [--seconds 5]
+    python -m benchmarks.bench_api --url http://127.0.0.1:8800 --endpoint status
+
+Without --url the script starts simulated SIM800L modems, a ModemPool and the
+API in-process (logging to a temporary file) and drives it with keep-alive
+clients, then prints requests per second and latency percentiles.
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from urllib.parse import urlparse
+
+from sim800.api import ControlAPI, PoolBackend, RequestLog
+from sim800.pool import ModemPool
+from sim800.simulator import SimulatedModem
+
+REQUESTS = {
+    "status": ("GET", "/status", None),
+    "inbox": ("GET", "/inbox", None),
+    "sms": ("POST", "/sms", {"number": "+995555000000", "text": "load test"}),
+}
+
+
+async def client(host, port, endpoint, stop_at, latencies, errors):
+    method, path, payload = REQUESTS[endpoint]
+    body = json.dumps(payload).encode() if payload is not None else b""
+    request = (f"{method} {path} HTTP/1.1\r\nHost: {host}\r\n"
+               f"Content-Length: {len(body)}\r\n\r\n").encode() + body
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < stop_at:
+            start = time.perf_counter()
+            writer.write(request)
+            status_line = await reader.readline()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                name, _, value = line.decode().partition(":")
+                if name.lower() == "content-length":
+                    length = int(value)
+            await reader.readexactly(length)
+            if b" 200 " not in status_line:
+                errors.append(status_line)
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+
+async def load(host, port, endpoint, clients, seconds):
+    latencies, errors = [], []
+    stop_at = time.perf_counter() + seconds
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, endpoint, stop_at, latencies, errors)
+                           for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    if not latencies:
+        print("No requests completed")
+        return
+    p50 = latencies[len(latencies) // 2]
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"{endpoint}: {len(latencies)} requests in {elapsed:.2f} s = {len(latencies) / elapsed:.0f} req/s, "
+          f"p50 {p50 * 1000:.1f} ms, p99 {p99 * 1000:.1f} ms, {len(errors)} errors")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", help="Existing API to test instead of an in-process one")
+    parser.add_argument("--endpoint", choices=sorted(REQUESTS), default="status")
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--modems", type=int, default=2)
+    parser.add_argument("--sms-delay", type=float, default=0.05, help="Simulated seconds per SMS")
+    args = parser.parse_args()
+
+    if args.url:
+        url = urlparse(args.url)
+        asyncio.run(load(url.hostname, url.port or 80, args.endpoint, args.clients, args.seconds))
+        return
+
+    sims = [SimulatedModem(f"sim{i}", sms_delay=args.sms_delay).start() for i in range(args.modems)]
+    pool = ModemPool([s.port for s in sims], sms_per_minute=10 ** 6)
+    pool.start()
+    with tempfile.TemporaryDirectory() as tmp:
+        log = RequestLog(os.path.join(tmp, "api_requests.jsonl"))
+        api = ControlAPI(PoolBackend(pool), port=0, log=log)
+        api.start_in_thread()
+        try:
+            asyncio.run(load(api.host, api.port, args.endpoint, args.clients, args.seconds))
+        finally:
+            log.close()
+            pool.stop()
+            for sim in sims:
+                sim.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Bulk-read throughput (AT+CMGL) at each UART rate.
+
+Usage:
+    python -m benchmarks.bench_baud [--messages 30] [--rates 9600 57600 115200]
+    python -m benchmarks.bench_baud --port /dev/ttyS0 [--rates 9600 115200]
+
+Without --port a simulated SIM800L paces its output like a UART at each rate
+and holds --messages 160-character messages. With --port the real modem is
+switched to each rate with AT+IPR (not saved with AT&W) and its current SIM
+inbox is read; it is switched back to the first rate at the end.
+"""
+import argparse
+import time
+
+from sim800.at import connect, negotiate_baud
+from sim800.sms import list_messages
+from sim800.simulator import SimulatedModem
+
+DEFAULT_RATES = [9600, 19200, 57600, 115200]
+
+
+def time_read(at, repeats):
+    """
+    Read the inbox `repeats` times; return (seconds per read, bytes per read, message count).
+    """
+    messages = list_messages(at)
+    size = sum(len(m["text"]) + 60 for m in messages)  # text plus the +CMGL header line
+    start = time.perf_counter()
+    for _ in range(repeats):
+        list_messages(at)
+    return (time.perf_counter() - start) / repeats, size, len(messages)
+
+
+def report(rate, elapsed, size, count):
+    print(f"{rate:>7} baud: {count} messages, ~{size} bytes in {elapsed * 1000:.0f} ms "
+          f"= {size / elapsed:.0f} B/s")
+
+
+def bench_simulator(rates, messages, repeats):
+    for rate in rates:
+        sim = SimulatedModem(baud_rate=rate).start()
+        for i in range(messages):
+            sim.inbox.append(("REC READ", f"+99555500{i:04d}", "24/01/01,12:00:00+16", "x" * 160))
+        try:
+            with connect(sim.port, rate, autobaud=False) as at:
+                report(rate, *time_read(at, repeats))
+        finally:
+            sim.stop()
+
+
+def bench_modem(port, rates, repeats):
+    with connect(port, rates[0]) as at:
+        start_rate = at.transport.baud_rate
+        try:
+            for rate in rates:
+                if negotiate_baud(at, rate, persist=False) != rate:
+                    print(f"{rate:>7} baud: modem did not switch, skipped")
+                    continue
+                report(rate, *time_read(at, repeats))
+        finally:
+            negotiate_baud(at, start_rate, persist=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--port", help="Real modem port; omit to use the simulator")
+    parser.add_argument("--rates", type=int, nargs="+", default=DEFAULT_RATES)
+    parser.add_argument("--messages", type=int, default=30, help="Simulated inbox size")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    if args.port:
+        bench_modem(args.port, args.rates, args.repeats)
+    else:
+        bench_simulator(args.rates, args.messages, args.repeats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+False command triggers per hour from the assistant's own audio, with and without echo control.
+
+Usage:
+    python -m benchmarks.bench_echo fixtures/echo [--model PATH]
+
+Each fixture is a mic recording made while prompts or call audio played and
+nobody spoke, so every intent the phone dialog's matcher finds in it is a
+false trigger. A sidecar NAME.ref.wav holds what was played at the same
+time (the speaker reference); fixtures without one are only scored raw.
+Modes: raw, gate (EchoGate driven by reference activity), aec
+(EchoCanceller on the reference) and both.
+"""
+import argparse
+import json
+
+import numpy as np
+
+from benchmarks.wav_harness import (DEFAULT_MODEL_PATH, SAMPLE_RATE, iter_blocks, load_fixtures, load_model,
+                                    new_recognizer)
+from sim800.dialog import KeywordMatcher
+from sim800.echo import EchoCanceller, EchoGate
+from sim800.phone_dialog import PHONE_PHRASES
+
+MODES = ("raw", "gate", "aec", "gate+aec")
+REFERENCE_ACTIVE_RMS = 200.0   # Reference blocks louder than this count as playback
+
+
+def reference_blocks(wav_path):
+    ref_path = wav_path[:-len(".wav")] + ".ref.wav"
+    try:
+        return [data for data, _ in iter_blocks(ref_path)]
+    except FileNotFoundError:
+        return None
+
+
+def count_triggers(model, matcher, wav_path, refs, mode):
+    """
+    Recognize one fixture through the given echo control mode and return
+    (triggers, texts).
+    """
+    recognizer = new_recognizer(model, words=False)
+    canceller = EchoCanceller() if "aec" in mode else None
+    clock = [0.0]
+    gate = EchoGate(clock=lambda: clock[0]) if "gate" in mode else None
+    playing = [False]
+    if gate is not None:
+        gate.add_source(lambda: playing[0])
+
+    texts = []
+    gated = False
+    for i, (data, audio_time) in enumerate(iter_blocks(wav_path)):
+        ref = refs[i] if i < len(refs) else bytes(len(data))
+        captured_at = audio_time - len(data) / 2 / SAMPLE_RATE
+        if canceller is not None:
+            data = canceller.process(data, ref)
+        if gate is not None:
+            clock[0] = audio_time
+            samples = np.frombuffer(ref, dtype="<i2").astype(np.float32)
+            playing[0] = len(samples) > 0 and float(np.sqrt(np.mean(samples ** 2))) > REFERENCE_ACTIVE_RMS
+            if gate.gated(captured_at):
+                if not gated:
+                    recognizer.Reset()
+                    gated = True
+                continue
+            gated = False
+        if recognizer.AcceptWaveform(data):
+            texts.append(json.loads(recognizer.Result()).get("text", ""))
+    texts.append(json.loads(recognizer.FinalResult()).get("text", ""))
+    texts = [t for t in texts if t]
+    return sum(len(matcher.match(t)) for t in texts), texts
+
+
+def run(fixture_dir, model_path):
+    fixtures = [p for p, _ in load_fixtures(fixture_dir) if not p.endswith(".ref.wav")]
+    if not fixtures:
+        print(f"No WAV fixtures in {fixture_dir}")
+        return
+    model = load_model(model_path)
+    matcher = KeywordMatcher(PHONE_PHRASES)
+
+    triggers = {mode: 0 for mode in MODES}
+    seconds = {mode: 0.0 for mode in MODES}
+    for wav_path in fixtures:
+        refs = reference_blocks(wav_path)
+        duration = sum(len(data) for data, _ in iter_blocks(wav_path)) / 2 / SAMPLE_RATE
+        print(f"{wav_path} ({duration:.0f} s{', no reference' if refs is None else ''})")
+        for mode in MODES if refs is not None else ("raw",):
+            count, texts = count_triggers(model, matcher, wav_path, refs or [], mode)
+            triggers[mode] += count
+            seconds[mode] += duration
+            print(f"  {mode:9s} {count:3d} trigger(s)  heard: {' | '.join(texts)[:100]}")
+
+    print()
+    for mode in MODES:
+        if seconds[mode]:
+            per_hour = triggers[mode] * 3600.0 / seconds[mode]
+            print(f"{mode:9s} {triggers[mode]:4d} false triggers in {seconds[mode] / 60:.1f} min "
+                  f"= {per_hour:.1f} per hour")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("fixtures", help="Directory of mic WAV fixtures with .ref.wav sidecars")
+    parser.add_argument("--model", default=DEFAULT_MODEL_PATH, help="Vosk model directory")
+    args = parser.parse_args()
+    run(args.fixtures, args.model)
+
+
+if __name__ == "__main__":
+    main()
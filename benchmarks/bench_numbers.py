@@ -0,0 +1,87 @@
+"""
+Number-entry accuracy and time-to-dial on the WAV harness.
+
+Usage:
+    python -m benchmarks.bench_numbers fixtures/numbers [--model PATH]
+
+Each fixture is one spoken number entry (possibly several utterances with
+"correction"/"back" in between) with a sidecar .txt holding the number that
+should be dialed, e.g. +995557598200. The legacy parser (words to digits,
+truncated to 9) is scored alongside for comparison.
+"""
+import argparse
+import time
+
+from benchmarks.wav_harness import DEFAULT_MODEL_PATH, iter_results, load_fixtures, load_model, new_recognizer
+from sim800.number_parser import COUNTRY_CODE, NumberEntry, words_from_result
+
+
+LEGACY_DIGITS = ["zero", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine"]
+
+
+def legacy_number(texts):
+    """
+    What the original voice loop would have dialed for the same utterances.
+    """
+    phone_number = ""
+    for text in texts:
+        for word in text.split():
+            if word in LEGACY_DIGITS:
+                phone_number += str(LEGACY_DIGITS.index(word))
+            elif word.isdigit():
+                phone_number += word
+        if len(phone_number) >= 9:
+            return COUNTRY_CODE + phone_number[:9]
+    return None
+
+
+def run(fixture_dir, model_path):
+    model = load_model(model_path)
+    fixtures = [(p, e) for p, e in load_fixtures(fixture_dir) if e]
+    if not fixtures:
+        print(f"No fixtures with expected numbers in {fixture_dir}")
+        return
+
+    correct = legacy_correct = 0
+    dial_times = []
+    parse_times = []
+    for wav_path, expected in fixtures:
+        recognizer = new_recognizer(model)
+        entry = NumberEntry()
+        texts = []
+        dialed_at = None
+        for result, audio_time, _ in iter_results(recognizer, wav_path):
+            texts.append(result.get("text", ""))
+            start = time.perf_counter()
+            entry.feed(words_from_result(result))
+            parse_times.append(time.perf_counter() - start)
+            if entry.complete:
+                dialed_at = audio_time
+                break
+        number = entry.full_number() if entry.complete else None
+        ok = number == expected
+        correct += ok
+        legacy_correct += legacy_number(texts) == expected
+        if dialed_at is not None:
+            dial_times.append(dialed_at)
+        print(f"{'OK ' if ok else 'BAD'} {wav_path}: expected {expected}, got {number}"
+              + (f" after {dialed_at:.2f} s of audio" if dialed_at is not None else ""))
+
+    n = len(fixtures)
+    print(f"\nAccuracy: {correct}/{n} ({100.0 * correct / n:.1f}%), legacy parser {legacy_correct}/{n}")
+    if dial_times:
+        print(f"Mean audio time to dial: {sum(dial_times) / len(dial_times):.2f} s")
+    if parse_times:
+        print(f"Mean parse time per utterance: {1e6 * sum(parse_times) / len(parse_times):.0f} us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("fixtures", help="Directory of WAV fixtures with .txt sidecars")
+    parser.add_argument("--model", default=DEFAULT_MODEL_PATH, help="Vosk model directory")
+    args = parser.parse_args()
+    run(args.fixtures, args.model)
+
+
+if __name__ == "__main__":
+    main()
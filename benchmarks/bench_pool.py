@@ -0,0 +1,51 @@
+"""
+Modem pool throughput against simulated SIM800L modems on ptys.
+
+Usage:
+    python -m benchmarks.bench_pool [--max-modems 4] [--messages 40] [--sms-delay 0.5]
+
+Sends the same batch of SMS through pools of 1..N simulated modems and prints
+messages per second, which should grow roughly linearly with the modem count.
+"""
+import argparse
+import time
+
+from sim800.pool import ModemPool
+from sim800.simulator import SimulatedModem
+
+
+def run_batch(modem_count, messages, sms_delay):
+    sims = [SimulatedModem(f"sim{i}", sms_delay=sms_delay).start() for i in range(modem_count)]
+    pool = ModemPool([s.port for s in sims], sms_per_minute=6000)
+    try:
+        pool.start()
+        start = time.perf_counter()
+        futures = [pool.send_sms(f"+99555500{i:04d}", f"Bulk message {i}") for i in range(messages)]
+        for future in futures:
+            future.result(timeout=60)
+        elapsed = time.perf_counter() - start
+    finally:
+        pool.stop()
+        for sim in sims:
+            sim.stop()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--max-modems", type=int, default=4)
+    parser.add_argument("--messages", type=int, default=40)
+    parser.add_argument("--sms-delay", type=float, default=0.5, help="Simulated seconds per SMS")
+    args = parser.parse_args()
+
+    baseline = None
+    for count in range(1, args.max_modems + 1):
+        elapsed = run_batch(count, args.messages, args.sms_delay)
+        rate = args.messages / elapsed
+        baseline = baseline or rate
+        print(f"{count} modem(s): {args.messages} SMS in {elapsed:.2f} s, "
+              f"{rate:.1f} SMS/s ({rate / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Cost and accuracy effect of the audio preprocessing stage on the WAV harness.
+
+Usage:
+    python -m benchmarks.bench_preprocess fixtures/commands [--model PATH] [--snr 5] [--rtf-only]
+
+Each fixture may have a sidecar .txt with the expected transcript. Every
+fixture is recognized twice, straight and through AudioPreprocessor, and
+the word error rate of both is reported along with the stage's real-time
+factor and worst block time against its CPU budget. --snr mixes white noise
+into the fixtures first; --rtf-only skips recognition (no vosk needed).
+"""
+import argparse
+
+import numpy as np
+
+from benchmarks.wav_harness import (BLOCK_FRAMES, DEFAULT_MODEL_PATH, SAMPLE_RATE, iter_blocks, iter_results,
+                                    load_fixtures, load_model, new_recognizer)
+from sim800.preprocess import AudioPreprocessor
+
+
+def word_errors(expected, got):
+    """
+    Word-level edit distance between two transcripts.
+    """
+    ref, hyp = expected.split(), got.split()
+    row = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        previous, row[0] = row[0], i
+        for j, h in enumerate(hyp, 1):
+            previous, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, previous + (r != h))
+    return row[-1]
+
+
+def add_noise(snr_db, seed=0):
+    """
+    Return a block transform mixing white noise in at the given SNR
+    (relative to the whole block, so silence gets the same noise as speech).
+    """
+    rng = np.random.default_rng(seed)
+    level = [None]
+
+    def transform(data):
+        x = np.frombuffer(data, dtype="<i2").astype(np.float32)
+        if level[0] is None:
+            level[0] = max(float(np.sqrt(np.mean(x * x))), 100.0) / 10 ** (snr_db / 20)
+        noisy = x + rng.normal(0, level[0], len(x)).astype(np.float32)
+        return np.clip(noisy, -32768, 32767).astype("<i2").tobytes()
+    return transform
+
+
+def chain(*stages):
+    stages = [s for s in stages if s is not None]
+
+    def transform(data):
+        for stage in stages:
+            data = stage(data)
+        return data
+    return transform
+
+
+def transcript(model, wav_path, transform):
+    recognizer = new_recognizer(model, words=False)
+    results = iter_results(recognizer, wav_path, transform=transform)
+    return " ".join(" ".join(r.get("text", "") for r, _, _ in results).split())
+
+
+def run(fixture_dir, model_path, snr, rtf_only):
+    fixtures = load_fixtures(fixture_dir)
+    if not fixtures:
+        print(f"No WAV fixtures in {fixture_dir}")
+        return
+
+    timing = AudioPreprocessor()
+    for wav_path, _ in fixtures:
+        noise = add_noise(snr) if snr is not None else None
+        for data, _ in iter_blocks(wav_path):
+            timing.process(noise(data) if noise else data)
+        timing.reset()
+    block_seconds = BLOCK_FRAMES / SAMPLE_RATE
+    print(f"Preprocessing: {timing.audio_seconds:.1f} s of audio in {timing.cpu_seconds * 1000:.0f} ms, "
+          f"real-time factor {timing.real_time_factor:.4f}")
+    print(f"Worst block: {timing.max_block_seconds * 1000:.1f} ms "
+          f"(budget {timing.budget * block_seconds * 1000:.1f} ms per {block_seconds * 1000:.0f} ms block)"
+          + ("" if timing.noise_suppression else "; noise suppression was disabled for exceeding it"))
+    if rtf_only:
+        return
+
+    model = load_model(model_path)
+    scored = [(p, e) for p, e in fixtures if e]
+    raw_errors = clean_errors = words = 0
+    for wav_path, expected in scored:
+        expected = expected.lower()
+        raw = transcript(model, wav_path, chain(add_noise(snr) if snr is not None else None))
+        clean = transcript(model, wav_path, chain(add_noise(snr) if snr is not None else None,
+                                                  AudioPreprocessor().process))
+        raw_errors += word_errors(expected, raw)
+        clean_errors += word_errors(expected, clean)
+        words += len(expected.split())
+        print(f"{wav_path}\n  expected:     {expected}\n  raw:          {raw}\n  preprocessed: {clean}")
+    if words:
+        label = f" at {snr:g} dB SNR" if snr is not None else ""
+        print(f"\nWord error rate{label}: raw {100.0 * raw_errors / words:.1f}%, "
+              f"preprocessed {100.0 * clean_errors / words:.1f}% ({len(scored)} fixtures, {words} words)")
+    else:
+        print("No fixtures with expected transcripts to score.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("fixtures", help="Directory of WAV fixtures with .txt sidecars")
+    parser.add_argument("--model", default=DEFAULT_MODEL_PATH, help="Vosk model directory")
+    parser.add_argument("--snr", type=float, default=None, help="Mix in white noise at this SNR (dB)")
+    parser.add_argument("--rtf-only", action="store_true", help="Only time the preprocessing stage")
+    args = parser.parse_args()
+    run(args.fixtures, args.model, args.snr, args.rtf_only)
+
+
+if __name__ == "__main__":
+    main()
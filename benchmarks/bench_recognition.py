@@ -0,0 +1,104 @@
+"""
+Memory per extra recognition stream and decoding throughput per core.
+
+Usage:
+    python -m benchmarks.bench_recognition fixtures/commands [--model PATH] [--streams 4]
+
+Memory: resident set size after loading the model once, then after each
+additional recognizer from the pool has decoded a block. Throughput: the
+fixtures are decoded by 1..N concurrent streams of RecognitionService, and
+the audio seconds decoded per wall second and per CPU second are reported.
+"""
+import argparse
+import os
+import time
+
+from benchmarks.wav_harness import DEFAULT_MODEL_PATH, iter_blocks, load_fixtures
+from sim800.recognition import RecognitionService, WavSource, shared_model
+
+
+def rss_mb():
+    """
+    Resident set size of this process in MB (Linux).
+    """
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024.0
+    return 0.0
+
+
+def measure_memory(model_path, fixture, streams):
+    base = rss_mb()
+    start = time.perf_counter()
+    model = shared_model(model_path)
+    print(f"Model load: {rss_mb() - base:.1f} MB in {time.perf_counter() - start:.1f} s")
+    service = RecognitionService(model=model)
+    block = next(iter_blocks(fixture))[0]
+    recognizers = []
+    previous = rss_mb()
+    for i in range(1, streams + 1):
+        recognizer = service.pool.acquire()
+        recognizer.AcceptWaveform(block)
+        recognizers.append(recognizer)
+        now = rss_mb()
+        print(f"  recognizer {i}: +{now - previous:.1f} MB (total {now:.1f} MB)")
+        previous = now
+    for recognizer in recognizers:
+        service.pool.release(recognizer)
+    return service
+
+
+def measure_throughput(service, fixtures, streams):
+    paths = [p for p, _ in fixtures]
+    results = []
+    start_wall = time.perf_counter()
+    start_cpu = time.process_time()
+    sessions = []
+    for i in range(streams):
+        # Each stream decodes every fixture back to back, starting at a different one
+        order = paths[i % len(paths):] + paths[:i % len(paths)]
+        sources = iter(order)
+        current = [WavSource(next(sources))]
+
+        def read(current=current, sources=sources):
+            while True:
+                data = current[0].read()
+                if data:
+                    return data
+                path = next(sources, None)
+                if path is None:
+                    return b""
+                current[0] = WavSource(path)
+
+        sessions.append(service.add_stream(f"stream{i}", read, lambda name, result: results.append(name)))
+    for i in range(streams):
+        service.wait(f"stream{i}")
+    wall = time.perf_counter() - start_wall
+    cpu = time.process_time() - start_cpu
+    audio = sum(s.audio_seconds for s in sessions)
+    print(f"{streams} stream(s): {audio:.0f} s of audio in {wall:.1f} s wall, {cpu:.1f} s CPU -> "
+          f"{audio / wall:.1f}x real time overall, {audio / max(cpu, 1e-9):.1f}x real time per core, "
+          f"{len(results)} results")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("fixtures", help="Directory of 16 kHz mono WAV fixtures")
+    parser.add_argument("--model", default=DEFAULT_MODEL_PATH, help="Vosk model directory")
+    parser.add_argument("--streams", type=int, default=os.cpu_count() or 4, help="Most concurrent streams to try")
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.fixtures)
+    if not fixtures:
+        print(f"No WAV fixtures in {args.fixtures}")
+        return
+    service = measure_memory(args.model, fixtures[0][0], args.streams)
+    print()
+    for streams in range(1, args.streams + 1):
+        measure_throughput(service, fixtures, streams)
+    print(f"Recognizers created for all runs: {service.pool.created}")
+
+
+if __name__ == "__main__":
+    main()
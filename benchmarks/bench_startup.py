@@ -0,0 +1,59 @@
+"""
+Cold-start cost of the entry points: wall time to import each module in a
+fresh interpreter, and which heavy dependencies the import pulls in.
+
+Usage:
+    python -m benchmarks.bench_startup [--runs 10] [module ...]
+
+Run it on a checkout before and after a change to compare.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+DEFAULT_MODULES = ["sim800", "sim800.sms", "sim800.sms_cli", "sim800.call", "sim800.pool", "sim800.api",
+                   "sim800.assistant"]
+HEAVY = ["vosk", "pyaudio", "pyttsx3", "numpy"]
+
+PROBE = (
+    "import importlib, sys\n"
+    "importlib.import_module(sys.argv[1])\n"
+    "print(','.join(m for m in sys.argv[2:] if m in sys.modules))\n"
+)
+
+
+def measure(module, runs):
+    times = []
+    loaded = ""
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, "-c", PROBE, module] + HEAVY,
+                              capture_output=True, text=True)
+        times.append(time.perf_counter() - start)
+        if proc.returncode != 0:
+            return None, proc.stderr.strip().splitlines()[-1]
+        loaded = proc.stdout.strip()
+    return statistics.median(times), loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    baseline, _ = measure("sys", args.runs)
+    print(f"{'interpreter only':24s} {baseline * 1000:7.1f} ms")
+    for module in args.modules:
+        elapsed, loaded = measure(module, args.runs)
+        if elapsed is None:
+            print(f"{module:24s}  failed: {loaded}")
+        else:
+            print(f"{module:24s} {elapsed * 1000:7.1f} ms  (+{(elapsed - baseline) * 1000:.1f} ms)"
+                  f"  heavy: {loaded or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Idle CPU and false triggers with and without the wake word gate.
+
+Usage:
+    python -m benchmarks.bench_wake fixtures/wake [--model PATH] [--wake-word computer]
+
+Fixtures without a sidecar are background audio (TV, conversation, a
+running car) in which any matched intent is a false trigger. Fixtures with
+a sidecar hold a spoken command that starts with the wake word (e.g.
+"computer call"); they measure whether the gate still lets real commands
+through. Each fixture is run through the full recognizer alone and through
+WakeWordGate in front of it, timing CPU with process_time.
+"""
+import argparse
+import json
+import time
+
+from benchmarks.wav_harness import DEFAULT_MODEL_PATH, iter_blocks, load_fixtures, load_model, new_recognizer
+from sim800.dialog import KeywordMatcher
+from sim800.phone_dialog import PHONE_PHRASES
+from sim800.wake import WAKE_WORD, WakeWordGate
+
+
+def recognize(model, wav_path, wake_word=None):
+    """
+    Return (texts, cpu_seconds, audio_seconds, wake_detections) for one fixture.
+    """
+    recognizer = new_recognizer(model, words=False)
+    gate = WakeWordGate(model, wake_word) if wake_word else None
+    texts = []
+    audio_seconds = 0.0
+    start = time.process_time()
+    for data, audio_seconds in iter_blocks(wav_path):
+        if gate is not None:
+            data = gate.feed(data)
+            if data is None:
+                continue
+        if recognizer.AcceptWaveform(data):
+            texts.append(json.loads(recognizer.Result()).get("text", ""))
+    texts.append(json.loads(recognizer.FinalResult()).get("text", ""))
+    cpu = time.process_time() - start
+    return [t for t in texts if t], cpu, audio_seconds, gate.detections if gate else 0
+
+
+def run(fixture_dir, model_path, wake_word):
+    fixtures = load_fixtures(fixture_dir)
+    if not fixtures:
+        print(f"No WAV fixtures in {fixture_dir}")
+        return
+    model = load_model(model_path)
+    matcher = KeywordMatcher(PHONE_PHRASES)
+
+    totals = {"always on": [0.0, 0.0, 0], "wake gate": [0.0, 0.0, 0]}  # cpu, background seconds, false triggers
+    commands = heard = 0
+    for wav_path, expected in fixtures:
+        print(wav_path + (f" (command: {expected})" if expected else " (background)"))
+        for label, word in (("always on", None), ("wake gate", wake_word)):
+            texts, cpu, seconds, detections = recognize(model, wav_path, word)
+            intents = [i for t in texts for i in matcher.match(t)]
+            print(f"  {label:9s} cpu {100.0 * cpu / max(seconds, 1e-9):5.1f}% of a core, "
+                  f"intents {intents}" + (f", wake words {detections}" if word else ""))
+            if expected:
+                if word:
+                    commands += 1
+                    heard += set(matcher.match(expected.lower())) <= set(intents)
+            else:
+                totals[label][0] += cpu
+                totals[label][1] += seconds
+                totals[label][2] += len(intents)
+
+    print()
+    for label, (cpu, seconds, triggers) in totals.items():
+        if seconds:
+            print(f"{label:9s} idle CPU {100.0 * cpu / seconds:5.1f}% of a core, "
+                  f"{triggers * 3600.0 / seconds:6.1f} false triggers per hour ({seconds / 60:.1f} min of background)")
+    if commands:
+        print(f"Commands after the wake word: {heard}/{commands} recognized through the gate")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("fixtures", help="Directory of WAV fixtures; sidecar .txt marks a wake word command")
+    parser.add_argument("--model", default=DEFAULT_MODEL_PATH, help="Vosk model directory")
+    parser.add_argument("--wake-word", default=WAKE_WORD)
+    args = parser.parse_args()
+    run(args.fixtures, args.model, args.wake_word)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Replay recorded WAV fixtures through Vosk the same way the mic loop does.
+
+A fixture directory holds 16 kHz mono 16-bit WAV files. Each WAV may have a
+sidecar text file with the same base name holding the expected outcome
+(e.g. the phone number for the number-entry benchmark).
+"""
+import glob
+import json
+import os
+import time
+import wave
+
+DEFAULT_MODEL_PATH = "/home/pi/Desktop/vosk-model-small-en-us-0.15"
+BLOCK_FRAMES = 4000            # Same block size as stream.read() in the voice loop
+SAMPLE_RATE = 16000
+
+
+def load_fixtures(directory):
+    """
+    Return a sorted list of (wav_path, expected) pairs.
+    expected is the stripped sidecar text, or None when there is no sidecar.
+    """
+    fixtures = []
+    for wav_path in sorted(glob.glob(os.path.join(directory, "*.wav"))):
+        expected = None
+        txt_path = os.path.splitext(wav_path)[0] + ".txt"
+        if os.path.exists(txt_path):
+            with open(txt_path) as f:
+                expected = f.read().strip()
+        fixtures.append((wav_path, expected))
+    return fixtures
+
+
+def iter_blocks(wav_path, block_frames=BLOCK_FRAMES):
+    """
+    Yield (block_bytes, audio_time) for a WAV file, where audio_time is the
+    position in seconds at the end of the block.
+    """
+    with wave.open(wav_path, "rb") as wf:
+        if wf.getnchannels() != 1 or wf.getsampwidth() != 2 or wf.getframerate() != SAMPLE_RATE:
+            raise ValueError(f"{wav_path}: expected 16 kHz mono 16-bit PCM")
+        position = 0
+        while True:
+            data = wf.readframes(block_frames)
+            if not data:
+                break
+            position += len(data) // 2
+            yield data, position / SAMPLE_RATE
+
+
+def iter_results(recognizer, wav_path, block_frames=BLOCK_FRAMES, transform=None):
+    """
+    Feed a WAV file through a recognizer block by block and yield
+    (result, audio_time, decode_seconds) for every final result, including
+    the one flushed at the end of the file. decode_seconds is the wall time
+    spent in the AcceptWaveform call that produced the result. If given,
+    transform(block_bytes) is applied to each block first, like a capture
+    path stage would be.
+    """
+    audio_time = 0.0
+    for data, audio_time in iter_blocks(wav_path, block_frames):
+        if transform is not None:
+            data = transform(data)
+        start = time.perf_counter()
+        final = recognizer.AcceptWaveform(data)
+        elapsed = time.perf_counter() - start
+        if final:
+            yield json.loads(recognizer.Result()), audio_time, elapsed
+    start = time.perf_counter()
+    result = json.loads(recognizer.FinalResult())
+    elapsed = time.perf_counter() - start
+    if result.get("text"):
+        yield result, audio_time, elapsed
+
+
+def load_model(model_path=DEFAULT_MODEL_PATH):
+    """
+    Load a Vosk model (imported lazily so fixture helpers work without vosk).
+    """
+    from vosk import Model
+    return Model(model_path)
+
+
+def new_recognizer(model, words=True):
+    """
+    Create a recognizer configured like the voice loop's.
+    """
+    from vosk import KaldiRecognizer
+    recognizer = KaldiRecognizer(model, SAMPLE_RATE)
+    recognizer.SetWords(words)
+    return recognizer
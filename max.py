@@ -1,19 +1,16 @@
-import pygame
-import time
-
-# Initialize pygame mixer
-pygame.mixer.init()
+from sim800.playback import close_engine, play_file, report_latency
 
 # Load and play the audio file
 def play_audio(file_path):
-    pygame.mixer.music.load(file_path)
-    pygame.mixer.music.play()
-    
-    while pygame.mixer.music.get_busy():  # Wait for the music to finish playing
-        time.sleep(0.1)
+    """
+    Play a WAV file through the shared playback engine and wait for it to finish.
+    """
+    voice = play_file(file_path)
+    report_latency(voice)
 
 if __name__ == "__main__":
     audio_file = "test.wav"  # Replace with your audio file path
     print("Playing audio...")
     play_audio(audio_file)
+    close_engine()
     print("Playback finished.")
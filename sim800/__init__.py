@@ -0,0 +1,35 @@
+"""
+Shared SIM800L modem and voice assistant code.
+
+Submodules are imported on first attribute access, so ``import sim800`` is
+cheap and the modem-only tools never load vosk, pyaudio or pyttsx3:
+
+    transport      serial port and line reader thread
+    at             AT command engine and URC dispatch
+    call           call state machine (dial, answer, hang up)
+    sms            text-mode SMS send and inbox
+    cdr            call detail records (SQLite) and recent calls
+    dtmf           DTMF tones during a call
+    contacts       local contact file (saved_numbers.txt)
+    phonebook      SIM phonebook sync with the contact file
+    audio_routing  PulseAudio loopbacks for call audio
+    preprocess     mic cleanup before recognition (NumPy)
+    echo           keep prompts and call audio out of recognition
+    recognition    shared Vosk model, recognizer pool, one worker per stream
+    wake           wake word gate in front of the command recognizer (vosk)
+    voicemail      auto-answer voicemail and call transcripts (vosk)
+    assistant      the voice assistant (vosk, pyaudio, pyttsx3)
+"""
+import importlib
+
+__all__ = [
+    "api", "assistant", "at", "audio_routing", "call", "cdr", "contacts", "dialog", "dtmf", "echo",
+    "number_parser", "phone_dialog", "phonebook", "playback", "pool", "preprocess", "recognition",
+    "recorder", "simulator", "sms", "sms_cli", "transport", "voicemail", "wake",
+]
+
+
+def __getattr__(name):
+    if name in __all__:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
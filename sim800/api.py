@@ -0,0 +1,274 @@
+import asyncio
+import json
+import os
+import re
+import threading
+import time
+
+# --- Control API Configuration ---
+API_HOST = "127.0.0.1"         # Local only; put a reverse proxy in front for remote access
+API_PORT = 8800
+REQUEST_LOG = "logs/api_requests.jsonl"
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUPS = 5
+MAX_BODY_BYTES = 64 * 1024
+NUMBER_PATTERN = re.compile(r"^\+?[0-9*#]{3,20}$")
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class RequestLog:
+    """
+    Append-only JSONL log of API requests, rotated by size
+    (api_requests.jsonl -> api_requests.jsonl.1 -> ... -> .N).
+    """
+
+    def __init__(self, path=REQUEST_LOG, max_bytes=LOG_MAX_BYTES, backups=LOG_BACKUPS):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.lock = threading.Lock()
+        self.file = None
+
+    def _open(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file = open(self.path, "a")
+
+    def _rotate(self):
+        self.file.close()
+        for i in range(self.backups - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._open()
+
+    def write(self, entry):
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
+        with self.lock:
+            if self.file is None:
+                self._open()
+            if self.file.tell() + len(line) > self.max_bytes and self.file.tell() > 0:
+                self._rotate()
+            self.file.write(line)
+            self.file.flush()
+
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+
+class PoolBackend:
+    """
+    Control API backend on top of a ModemPool.
+    """
+
+    def __init__(self, pool, call_duration=30):
+        self.pool = pool
+        self.call_duration = call_duration
+
+    def dial(self, number, duration=None):
+        self.pool.call(number, duration or self.call_duration)
+        return {"queued": True, "number": number}
+
+    def hang_up(self):
+        return {"hung_up": self.pool.hang_up()}
+
+    def send_sms(self, number, text):
+        return {"reference": self.pool.send_sms(number, text).result(timeout=90)}
+
+    def inbox(self):
+        return {"messages": self.pool.inbox().result(timeout=30)}
+
+    def status(self):
+        return {"modems": self.pool.status()}
+
+
+class ControlAPI:
+    """
+    Minimal asyncio HTTP/1.1 server exposing the call and SMS backend as JSON:
+
+        POST /dial    {"number": "+995...", "duration": 30}
+        POST /hangup
+        POST /sms     {"number": "+995...", "text": "..."}
+        GET  /inbox
+        GET  /status
+
+    Backend calls block on the serial port, so they run in the default
+    executor and never stall the event loop.
+    """
+
+    def __init__(self, backend, host=API_HOST, port=API_PORT, log=None):
+        self.backend = backend
+        self.host = host
+        self.port = port
+        self.log = log if log is not None else RequestLog()
+        self.server = None
+        self.loop = None
+        self.routes = {
+            ("POST", "/dial"): self._dial,
+            ("POST", "/hangup"): lambda body: self.backend.hang_up(),
+            ("POST", "/sms"): self._sms,
+            ("GET", "/inbox"): lambda body: self.backend.inbox(),
+            ("GET", "/status"): lambda body: self.backend.status(),
+        }
+
+    def _dial(self, body):
+        number, duration = str(body.get("number", "")), body.get("duration")
+        if not NUMBER_PATTERN.match(number):
+            raise ValueError("'number' must be 3 to 20 digits, * or #, with an optional leading +")
+        if duration is not None:
+            numeric = isinstance(duration, (int, float)) and not isinstance(duration, bool)
+            if not numeric or not 0 < duration < float("inf"):
+                raise ValueError("'duration' must be a positive number of seconds")
+        return self.backend.dial(number, duration)
+
+    def _sms(self, body):
+        number, text = str(body.get("number", "")), body.get("text")
+        if not NUMBER_PATTERN.match(number):
+            raise ValueError("'number' must be 3 to 20 digits, * or #, with an optional leading +")
+        if text is None:
+            raise ValueError("'text' is required")
+        return self.backend.send_sms(number, str(text))
+
+    async def start(self):
+        self.loop = asyncio.get_running_loop()
+        self.server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        print(f"Control API listening on http://{self.host}:{self.port}")
+
+    async def serve_forever(self):
+        await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    def start_in_thread(self):
+        """
+        Run the server on its own event loop in a daemon thread,
+        next to the blocking voice loop. Returns the thread.
+        """
+        ready = threading.Event()
+
+        def run():
+            async def main():
+                await self.start()
+                ready.set()
+                async with self.server:
+                    await self.server.serve_forever()
+            try:
+                asyncio.run(main())
+            except Exception as e:
+                print("Control API error:", e)
+                ready.set()
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        ready.wait(timeout=5)
+        return thread
+
+    async def _handle_connection(self, reader, writer):
+        peer = writer.get_extra_info("peername")
+        client = peer[0] if peer else None
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body, started, error = request
+                if error is not None:
+                    status, payload = error
+                else:
+                    status, payload = await self._dispatch(method, path, body)
+                # A body that was not read (too large, bad length) leaves the connection unusable
+                keep_alive = error is None and headers.get("connection", "").lower() != "close"
+                self._respond(writer, status, payload, keep_alive)
+                await writer.drain()
+                self._log(client, method, path, body, status, started)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader):
+        """
+        Read one request. Returns (method, path, headers, body, started, error)
+        where error is a (status, payload) response when the body could not be
+        read, or None at the end of the connection.
+        """
+        line = await reader.readline()
+        if not line:
+            return None
+        started = time.perf_counter()
+        try:
+            method, target, _ = line.decode("latin-1").split(" ", 2)
+        except ValueError:
+            return None
+        headers = {}
+        while True:
+            header = await reader.readline()
+            if header in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = header.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        length = headers.get("content-length", "") or "0"
+        body, error = None, None
+        if not (length.isascii() and length.isdigit()):
+            error = 400, {"error": f"invalid Content-Length {length!r}"}
+        elif int(length) > MAX_BODY_BYTES:
+            error = 413, {"error": "request body too large"}
+        else:
+            body = await reader.readexactly(int(length)) if int(length) else b""
+        return method.upper(), target.split("?", 1)[0], headers, body, started, error
+
+    async def _dispatch(self, method, path, body):
+        handler = self.routes.get((method, path))
+        if handler is None:
+            if any(p == path for _, p in self.routes):
+                return 405, {"error": f"{method} not allowed on {path}"}
+            return 404, {"error": f"no route for {path}"}
+        try:
+            data = json.loads(body) if body else {}
+            if not isinstance(data, dict):
+                raise ValueError("body must be a JSON object")
+        except ValueError as e:
+            return 400, {"error": f"invalid JSON: {e}"}
+        try:
+            result = await self.loop.run_in_executor(None, handler, data)
+            return 200, result
+        except ValueError as e:
+            return 400, {"error": str(e)}
+        except Exception as e:
+            return 503, {"error": str(e)}
+
+    def _respond(self, writer, status, payload, keep_alive):
+        body = json.dumps(payload).encode()
+        head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode() + body)
+
+    def _log(self, client, method, path, body, status, started):
+        try:
+            data = json.loads(body) if body else None
+        except ValueError:
+            data = None
+        self.log.write({
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "client": client,
+            "method": method,
+            "path": path,
+            "body": data,
+            "status": status,
+            "ms": round((time.perf_counter() - started) * 1000, 2)
+        })
@@ -0,0 +1,449 @@
+import json
+import threading
+import time
+
+from sim800.at import connect
+from sim800.audio_routing import delete_all_routings, switch_audio_routing
+from sim800.call import CallManager
+from sim800.cdr import CallLog
+from sim800.contacts import save_contact
+from sim800.number_parser import words_from_result
+from sim800.phone_dialog import build_phone_dialog
+from sim800.sms import list_messages, send_sms
+from sim800.transport import BAUD_RATE, SERIAL_PORT
+
+# vosk, pyaudio, pyttsx3 and numpy are imported where they are first needed,
+# so importing this module (or the sim800 package) stays cheap.
+
+# --- Global Variables ---
+calls = None             # CallManager tracking the modem's call state
+call_log = None          # CallLog recording every call, if enabled
+voicemail = None         # Voicemail taking messages, if enabled
+engine = None            # Global TTS engine
+recorder = None          # CallRecorder for the active call, if recording is enabled
+call_audio = False       # True while the call loopbacks are loaded
+call_audio_lock = threading.Lock()
+echo_gate = None         # EchoGate muting recognition while we are talking, if enabled
+echo_tap = None          # ReferenceTap on the call audio for the echo canceller, during calls
+echo_canceller = None
+
+# --- Calls ---
+MAX_CALL_DURATION = 30   # Seconds before an outgoing call is hung up (None: no limit)
+
+# --- Call Recording ---
+RECORD_CALLS = False     # Record both directions of every call to ./recordings
+RECORD_STEREO = False    # Keep the two directions as left/right instead of mixing
+RECORD_CODEC = "wav"     # "wav", "flac" or "opus" (needs flac/opusenc installed)
+
+# --- Control API ---
+API_ENABLED = False      # Serve the HTTP/JSON control API (see sim800/api.py) next to the voice loop
+
+# --- Call Log ---
+CALL_LOG_ENABLED = True  # Record every call in calls.db (see sim800/cdr.py)
+
+# --- Voicemail and Transcripts ---
+VOICEMAIL_ENABLED = False  # Answer unanswered calls and take a message (see sim800/voicemail.py)
+TRANSCRIBE_CALLS = False   # Transcribe answered calls live; both are stored with the call record
+
+# --- Phonebook ---
+PHONEBOOK_SYNC = True    # Sync the SIM phonebook with saved_numbers.txt at startup (see sim800/phonebook.py)
+
+# --- Voice Recognition ---
+MODEL_PATH = "/home/pi/Desktop/vosk-model-small-en-us-0.15"  # Update as needed
+DEVICE_INDEX = 2         # Input device index; see the list printed at startup
+PREPROCESS_AUDIO = False # DC removal, noise suppression and AGC before recognition (see sim800/preprocess.py)
+ECHO_GATE = True         # Don't recognize our own prompts (see sim800/echo.py)
+ECHO_CANCEL = False      # Cancel the call's far end from the mic during calls (needs parec)
+WAKE_WORD_GATE = True    # Only take commands after the wake word (see sim800/wake.py)
+
+def init_tts():
+    """
+    Initialize the global TTS engine.
+    """
+    global engine
+    if engine is None:
+        import pyttsx3
+        engine = pyttsx3.init('espeak')
+        engine.setProperty('rate', 125)
+        engine.setProperty('volume', 1.0)
+
+def speak(text):
+    """
+    Speak the provided text using pyttsx3.
+    """
+    init_tts()
+    if echo_gate is not None:
+        echo_gate.begin()
+    try:
+        engine.say(text)
+        engine.runAndWait()
+    except Exception as e:
+        print("TTS error:", e)
+    finally:
+        if echo_gate is not None:
+            echo_gate.end()
+    time.sleep(0.5)
+
+def init_modem():
+    """
+    Open the modem, enable caller ID and start tracking calls.
+    Returns the ATEngine, or None if the modem does not respond.
+    """
+    global calls, call_log
+    try:
+        at = connect(SERIAL_PORT, BAUD_RATE)
+        print("Serial connection established.")
+        calls = CallManager(at)
+        calls.enable_caller_id()
+        calls.enable_call_reports()
+        calls.add_listener(on_call_event)
+        if CALL_LOG_ENABLED:
+            call_log = CallLog().attach(calls)
+        return at
+    except Exception as e:
+        print("Serial connection error:", e)
+        return None
+
+def sync_phonebook_in_background(at):
+    """
+    Run the SIM phonebook sync on its own thread so startup does not wait for it.
+    """
+    def run():
+        from sim800.phonebook import sync_phonebook
+        try:
+            stats = sync_phonebook(at)
+            print("Phonebook synced:", ", ".join(f"{k} {v}" for k, v in stats.items()))
+        except Exception as e:
+            print("Phonebook sync error:", e)
+
+    threading.Thread(target=run, daemon=True).start()
+
+def start_voicemail_and_transcripts():
+    """
+    Attach voicemail and live call transcription, sharing the voice loop's model.
+    """
+    global voicemail
+    from sim800.recognition import RecognitionService
+    from sim800.voicemail import CallTranscriber, Voicemail
+    try:
+        service = RecognitionService(MODEL_PATH)
+    except Exception as e:
+        print(f"Error loading model from {MODEL_PATH}: {e}")
+        return
+    if VOICEMAIL_ENABLED:
+        voicemail = Voicemail(service, call_log, start_audio=start_call_audio,
+                              release_audio=release_call_audio).attach(calls)  # None without a greeting
+    if TRANSCRIBE_CALLS:
+        CallTranscriber(service, call_log, skip=lambda: voicemail is not None and voicemail.busy).attach(calls)
+
+def start_call_recording(label):
+    """
+    Start recording the call if RECORD_CALLS is enabled.
+    Must be called after the loopbacks have been loaded.
+    """
+    global recorder
+    if not RECORD_CALLS or recorder is not None:
+        return
+    try:
+        from sim800.recorder import CallRecorder
+        recorder = CallRecorder(label, stereo=RECORD_STEREO, codec=RECORD_CODEC)
+        recorder.start()
+    except Exception as e:
+        print("Error starting call recording:", e)
+        recorder = None
+
+def stop_call_recording():
+    """
+    Stop the call recording, if one is running.
+    """
+    global recorder
+    if recorder is not None:
+        recorder.stop()
+        recorder = None
+
+def start_call_audio(label):
+    """
+    Load the call loopbacks and start recording.
+    """
+    global call_audio, echo_tap, echo_canceller
+    with call_audio_lock:
+        switch_audio_routing()
+        call_audio = True
+        start_call_recording(label)
+        if ECHO_CANCEL:
+            try:
+                from sim800.echo import EchoCanceller, ReferenceTap
+                echo_canceller = EchoCanceller()
+                echo_tap = ReferenceTap().start()
+            except Exception as e:
+                print("Error starting echo cancellation:", e)
+
+def release_call_audio():
+    """
+    Stop recording and unload the call loopbacks, once per call.
+    """
+    global call_audio, echo_tap
+    with call_audio_lock:
+        if not call_audio:
+            return
+        call_audio = False
+        if echo_tap is not None:
+            echo_tap.stop()
+            echo_tap = None
+        stop_call_recording()
+        delete_all_routings()
+
+def on_call_event(event, manager):
+    """
+    Free the call's audio as soon as the call ends, however it ended.
+    Runs on the serial reader thread, so the teardown gets its own thread.
+    """
+    if event == "ended":
+        print(f"Call ended: {manager.end_reason}")
+        threading.Thread(target=release_call_audio, daemon=True).start()
+
+def hang_up_call(at):
+    """
+    Hang up the active call by sending the ATH command and deleting the audio routings.
+    """
+    calls.hang_up()
+    release_call_audio()
+    speak("Call ended")
+
+def dial_number(at, full_phone_number, max_duration=MAX_CALL_DURATION):
+    """
+    Dial the given phone number via the SIM800L and hang up after max_duration seconds
+    (None for no limit). The call ends early when the far end hangs up or the call fails.
+    Runs in its own thread so that voice commands (e.g., 'hang up') can be processed concurrently.
+    """
+    print("Preparing to dial...")
+    start_call_audio(full_phone_number)
+    print(f"Dialing: {full_phone_number}")
+    if calls.dial(full_phone_number):
+        print("Call initiated successfully.")
+    else:
+        print(f"Call initiation failed: {calls.end_reason}")
+        release_call_audio()
+        return
+
+    if not calls.wait_end(max_duration):
+        calls.hang_up("timeout")
+        release_call_audio()
+        speak("Call ended")
+        print("Call ended automatically after timeout.")
+
+def list_audio_devices(p):
+    """
+    List available audio input devices.
+    """
+    print("Available audio devices:")
+    for i in range(p.get_device_count()):
+        info = p.get_device_info_by_index(i)
+        if info.get("maxInputChannels") > 0:
+            print(f"  Device {i}: {info.get('name')} (Channels: {info.get('maxInputChannels')})")
+
+def answer_call(at):
+    """
+    Answer the incoming call, if there is one. Returns False otherwise.
+    """
+    if not calls.incoming:
+        return False
+    start_call_audio(calls.number or "incoming")
+    if not calls.answer():
+        release_call_audio()
+        return False
+    speak("Call answered")
+    return True
+
+class PhoneActions:
+    """
+    The side effects the dialog can trigger, bound to one modem.
+    """
+
+    def __init__(self, at):
+        self.at = at
+
+    def speak(self, text):
+        speak(text)
+
+    def dial(self, number):
+        threading.Thread(target=dial_number, args=(self.at, number)).start()
+
+    def answer(self):
+        return answer_call(self.at)
+
+    def hang_up(self):
+        if not calls.in_call:
+            return False
+        hang_up_call(self.at)
+        return True
+
+    def save_contact(self, name, number):
+        save_contact(name, number)
+
+    def last_number(self, direction):
+        return call_log.last_number(direction) if call_log is not None else None
+
+class ApiBackend:
+    """
+    Control API backend sharing the voice loop's modem.
+    """
+
+    def __init__(self, at):
+        self.at = at
+
+    def dial(self, number, duration=None):
+        if calls.state != "idle":
+            raise RuntimeError(f"Modem is busy ({calls.state})")
+        threading.Thread(target=dial_number, args=(self.at, number, duration or MAX_CALL_DURATION)).start()
+        return {"dialing": number}
+
+    def hang_up(self):
+        if not calls.in_call:
+            return {"hung_up": 0}
+        hang_up_call(self.at)
+        return {"hung_up": 1}
+
+    def send_sms(self, number, text):
+        return {"reference": send_sms(self.at, number, text)}
+
+    def inbox(self):
+        return {"messages": list_messages(self.at)}
+
+    def status(self):
+        return {"call_state": calls.state, "number": calls.number}
+
+def voice_recognition_loop(at):
+    """
+    Main loop for voice recognition.
+    Each final result is handed to the phone dialog (see phone_dialog.py),
+    which handles the call, hang up, answer, and save number commands.
+    """
+    global echo_gate
+    import pyaudio
+    from vosk import KaldiRecognizer
+
+    from sim800.recognition import shared_model
+
+    dialog = build_phone_dialog(PhoneActions(at))
+
+    p = pyaudio.PyAudio()
+    list_audio_devices(p)
+
+    print(f"Using audio device index: {DEVICE_INDEX}")
+
+    try:
+        model = shared_model(MODEL_PATH)
+    except Exception as e:
+        print(f"Error loading model from {MODEL_PATH}: {e}")
+        return
+
+    recognizer = KaldiRecognizer(model, 16000)
+    recognizer.SetWords(True)  # Per-word confidences for the number parser
+
+    wake = None
+    if WAKE_WORD_GATE:
+        from sim800.wake import WAKE_WORD, WakeWordGate
+        wake = WakeWordGate(model)
+        print(f"Say '{WAKE_WORD}' before a command.")
+    listening = wake is None
+    try:
+        stream = p.open(
+            format=pyaudio.paInt16,
+            channels=1,
+            rate=16000,
+            input=True,
+            input_device_index=DEVICE_INDEX,
+            frames_per_buffer=8000
+        )
+    except Exception as e:
+        print(f"Error opening audio stream: {e}")
+        return
+
+    if ECHO_GATE:
+        from sim800.echo import EchoGate
+        from sim800.playback import shared_engine_playing
+        echo_gate = EchoGate()
+        echo_gate.add_source(shared_engine_playing)
+        echo_gate.add_source(lambda: voicemail is not None and voicemail.playing)
+    gated = False
+
+    preprocessor = None
+    if PREPROCESS_AUDIO:
+        from sim800.preprocess import AudioPreprocessor
+        preprocessor = AudioPreprocessor()
+
+    stream.start_stream()
+    print("Listening... Press Ctrl+C to stop.")
+
+    try:
+        while True:
+            data = stream.read(4000, exception_on_overflow=False)
+            # Blocks still queued were captured earlier, e.g. while speak() was blocking
+            captured_at = time.monotonic() - (stream.get_read_available() + 4000) / 16000
+            tap = echo_tap
+            if tap is not None:
+                data = echo_canceller.process(data, tap.read(4000))
+            if preprocessor is not None:
+                data = preprocessor.process(data)
+            if echo_gate is not None and echo_gate.gated(captured_at):
+                if not gated:
+                    recognizer.Reset()  # Drop any partial hypothesis picked up from the prompt
+                    gated = True
+                continue
+            gated = False
+            # Mid-dialog (e.g. entering digits) and while a call rings, no wake word is needed
+            if wake is not None and dialog.state == "idle" and not calls.incoming:
+                data = wake.feed(data)
+                if data is None:
+                    if listening:
+                        recognizer.Reset()
+                        listening = False
+                    continue
+                if not listening:
+                    print("Wake word heard, listening for a command...")
+                    listening = True
+            if recognizer.AcceptWaveform(data):
+                result = json.loads(recognizer.Result())
+                text = result.get("text", "").lower()
+                if text:
+                    print("You said:", text)
+                    if dialog.handle(text, words_from_result(result)) and wake is not None:
+                        wake.extend()  # Room for a follow-up command without the wake word
+            elif wake is not None and wake.awake and json.loads(recognizer.PartialResult()).get("partial"):
+                wake.extend()  # Still speaking: don't close the window (and reset) mid-command
+    except KeyboardInterrupt:
+        print("Exiting voice recognition loop...")
+    finally:
+        stream.stop_stream()
+        stream.close()
+        p.terminate()
+
+def main():
+    at = init_modem()
+    if at is None:
+        print("Unable to initialize serial connection. Exiting.")
+        return
+
+    if PHONEBOOK_SYNC:
+        sync_phonebook_in_background(at)
+
+    if VOICEMAIL_ENABLED or TRANSCRIBE_CALLS:
+        start_voicemail_and_transcripts()
+
+    if API_ENABLED:
+        from sim800.api import ControlAPI
+        ControlAPI(ApiBackend(at)).start_in_thread()
+
+    try:
+        voice_recognition_loop(at)
+    except Exception as e:
+        print("An error occurred in the main loop:", e)
+    finally:
+        at.close()
+        if call_log is not None:
+            call_log.close()
+        print("Serial connection closed.")
+
+if __name__ == "__main__":
+    main()
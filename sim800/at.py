@@ -0,0 +1,272 @@
+import json
+import os
+import queue
+import threading
+import time
+
+from sim800.transport import BAUD_CANDIDATES, BAUD_RATE, SERIAL_PORT, TARGET_BAUD_RATE, SerialTransport
+
+BAUD_CACHE_FILE = os.path.expanduser("~/.sim800_baud.json")  # Last working rate per port
+PROBE_TIMEOUT = 0.3         # How long to try AT at one rate before moving to the next
+
+CALL_PROGRESS = ("NO CARRIER", "BUSY", "NO ANSWER", "NO DIALTONE")
+FINAL_RESPONSES = ("OK", "ERROR") + CALL_PROGRESS
+ERROR_PREFIXES = ("+CME ERROR", "+CMS ERROR")
+
+# Lines that are always unsolicited, even while a command is waiting for its response
+ALWAYS_URC = ("RING", "+CLIP:", "+CMTI:", "+CRING:", "+CUSD:", "Call Ready", "SMS Ready",
+              "UNDER-VOLTAGE")
+CALL_COMMANDS = ("ATD", "ATA", "ATH")   # Commands whose reply can be a call-progress result
+
+
+class ATError(Exception):
+    """
+    The modem answered a command with ERROR, +CME ERROR or +CMS ERROR.
+    """
+
+    def __init__(self, command, lines):
+        super().__init__(f"{command} failed: {lines[-1] if lines else 'no response'}")
+        self.command = command
+        self.lines = lines
+
+
+def is_final(line):
+    """
+    True if the line ends an AT command's response.
+    """
+    return line in FINAL_RESPONSES or line.startswith(ERROR_PREFIXES)
+
+
+class ATEngine:
+    """
+    Send AT commands and wait for their final result code instead of sleeping
+    a fixed delay. Lines arriving while no command is pending (and the
+    always-unsolicited ones like RING) are dispatched to URC handlers.
+    """
+
+    def __init__(self, transport):
+        self.transport = transport
+        self.transport.on_line = self._on_line
+        self.lock = threading.RLock()
+        self.pending = None
+        self.pending_command = None
+        self.urc_handlers = []
+        self.verbose = False
+
+    # --- Lifecycle ---
+
+    def close(self):
+        self.transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- Commands ---
+
+    def command(self, command, timeout=5.0, payload=None, check=True):
+        """
+        Send a command and return its response lines (echo and final OK stripped).
+        If payload is given, it is sent followed by Ctrl+Z once the modem shows
+        the "> " prompt (AT+CMGS, AT+CMGW). Raises ATError on an error result when
+        check is True, and TimeoutError if no final result arrives in time.
+        Call-progress results (NO CARRIER, BUSY, ...) are returned as the last line.
+        """
+        with self.lock:
+            self.pending = queue.Queue()
+            self.pending_command = command
+            try:
+                if self.verbose:
+                    print(f">> {command}")
+                self.transport.write((command + "\r").encode())
+                lines = []
+                deadline = time.monotonic() + timeout
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(f"No final response to {command!r}: {lines}")
+                    try:
+                        line = self.pending.get(timeout=remaining)
+                    except queue.Empty:
+                        continue
+                    if self.verbose:
+                        print(f"<< {line}")
+                    if line == ">" and payload is not None:
+                        data = payload.encode() if isinstance(payload, str) else payload
+                        self.transport.write(data + bytes([26]))
+                        payload = None
+                        continue
+                    if is_final(line):
+                        if line == "OK":
+                            return lines
+                        lines.append(line)
+                        if check and (line == "ERROR" or line.startswith(ERROR_PREFIXES)):
+                            raise ATError(command, lines)
+                        return lines
+                    lines.append(line)
+            finally:
+                self.pending = None
+                self.pending_command = None
+
+    def query(self, command, prefix=None, timeout=5.0):
+        """
+        Send a query and return the value of its first "+PREFIX: value" line,
+        or None if there is none.
+        """
+        prefix = prefix or command[2:].split("=")[0].rstrip("?") + ":"
+        for line in self.command(command, timeout=timeout):
+            if line.startswith(prefix):
+                return line[len(prefix):].strip()
+        return None
+
+    # --- Unsolicited result codes ---
+
+    def on_urc(self, prefix, handler):
+        """
+        Call handler(line) for every unsolicited line starting with prefix.
+        """
+        self.urc_handlers.append((prefix, handler))
+
+    def remove_urc(self, handler):
+        self.urc_handlers = [(p, h) for p, h in self.urc_handlers if h is not handler]
+
+    def _is_reply(self, line):
+        """
+        True if the line belongs to the pending command's response. Call-progress
+        results only answer ATD/ATA/ATH and +CLCC lines only AT+CLCC; while any
+        other command is waiting they are unsolicited (the call ended meanwhile).
+        """
+        if line.startswith(ALWAYS_URC):
+            return False
+        command = (self.pending_command or "").upper()
+        if line in CALL_PROGRESS:
+            return command.startswith(CALL_COMMANDS)
+        if line.startswith("+CLCC:"):
+            return command == "AT+CLCC"
+        return True
+
+    def _on_line(self, line):
+        pending = self.pending
+        if pending is not None and self._is_reply(line):
+            if line != self.pending_command:
+                pending.put(line)
+            return
+        for prefix, handler in list(self.urc_handlers):
+            if line.startswith(prefix):
+                try:
+                    handler(line)
+                except Exception as e:
+                    print(f"Error in URC handler for {line!r}:", e)
+
+
+def wait_ready(at, timeout=10.0, interval=0.1):
+    """
+    Poll "AT" until the modem answers OK, instead of sleeping a fixed time
+    after opening the port. Returns the seconds it took; raises TimeoutError.
+    """
+    start = time.monotonic()
+    while True:
+        try:
+            at.command("AT", timeout=interval * 3)
+            return time.monotonic() - start
+        except (TimeoutError, ATError):
+            if time.monotonic() - start >= timeout:
+                raise TimeoutError(f"Modem on {at.transport.port} not ready after {timeout:.0f} s")
+            time.sleep(interval)
+
+
+def load_baud_cache():
+    try:
+        with open(BAUD_CACHE_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_baud_cache(port, baud_rate):
+    cache = load_baud_cache()
+    if cache.get(port) == baud_rate:
+        return
+    cache[port] = baud_rate
+    try:
+        with open(BAUD_CACHE_FILE, "w") as f:
+            json.dump(cache, f)
+    except OSError as e:
+        print("Could not save baud rate cache:", e)
+
+
+def detect_baud(at, candidates=BAUD_CANDIDATES, timeout=10.0):
+    """
+    Find the rate the modem is answering at by trying AT at each candidate
+    in turn (a SIM800L in autobaud mode locks onto the first AT it hears).
+    Leaves the transport at the detected rate and returns it.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        for rate in candidates:
+            at.transport.set_baud_rate(rate)
+            try:
+                wait_ready(at, PROBE_TIMEOUT, interval=0.05)
+                return rate
+            except TimeoutError:
+                pass
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Modem on {at.transport.port} did not answer at any of {list(candidates)} baud")
+
+
+def negotiate_baud(at, target, persist=True):
+    """
+    Switch the modem and the port to `target` baud with AT+IPR, saving it in
+    the modem profile with AT&W when persist is set. If the modem does not
+    answer at the new rate, fall back to the old one. Returns the rate in use.
+    """
+    current = at.transport.baud_rate
+    if target == current:
+        return current
+    try:
+        at.command(f"AT+IPR={target}")
+        at.transport.set_baud_rate(target)
+        wait_ready(at, PROBE_TIMEOUT * 2)
+        if persist:
+            at.command("AT&W")
+        print(f"Modem switched from {current} to {target} baud.")
+        return target
+    except Exception as e:
+        print(f"Switching to {target} baud failed ({e}); staying at {current}.")
+        at.transport.set_baud_rate(current)
+        try:
+            wait_ready(at, PROBE_TIMEOUT * 2)
+        except TimeoutError:
+            detect_baud(at, list(dict.fromkeys((current, target) + tuple(BAUD_CANDIDATES))))
+        return at.transport.baud_rate
+
+
+def connect(port=SERIAL_PORT, baud_rate=BAUD_RATE, timeout=2.0, target_baud=TARGET_BAUD_RATE,
+            autobaud=True):
+    """
+    Open the modem on a serial port and wait until it answers AT.
+    With autobaud the last rate that worked on this port is tried first and the
+    other candidate rates after it if the modem stays silent; with target_baud
+    the modem is switched to that rate. Returns an ATEngine; raises if the port
+    cannot be opened or the modem stays silent.
+    """
+    preferred = load_baud_cache().get(port, baud_rate) if autobaud else baud_rate
+    transport = SerialTransport(port, preferred).open()
+    engine = ATEngine(transport)
+    try:
+        try:
+            wait_ready(engine, min(timeout, PROBE_TIMEOUT) if autobaud else timeout)
+        except TimeoutError:
+            if not autobaud:
+                raise
+            candidates = [preferred] + [r for r in (baud_rate,) + tuple(BAUD_CANDIDATES) if r != preferred]
+            detect_baud(engine, list(dict.fromkeys(candidates)), timeout)
+        if target_baud:
+            negotiate_baud(engine, target_baud)
+        save_baud_cache(port, transport.baud_rate)
+    except Exception:
+        engine.close()
+        raise
+    return engine
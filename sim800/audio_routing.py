@@ -0,0 +1,41 @@
+import subprocess
+
+# --- PulseAudio Devices ---
+# Bluetooth side (SIM800L audio bridged over Bluetooth) and the C-Media USB sound card
+BT_SOURCE = "bluez_input.9F_DA_07_42_18_F4.0"
+BT_SINK = "bluez_output.9F_DA_07_42_18_F4.1"
+USB_SOURCE = "alsa_input.usb-C-Media_Electronics_Inc._USB_Audio_Device-00.mono-fallback"
+USB_SINK = "alsa_output.usb-C-Media_Electronics_Inc._USB_Audio_Device-00.analog-stereo"
+LOOPBACK_LATENCY_MSEC = 30
+
+# The two loopback directions, tapped at the monitor of the sink each one plays into
+CALL_TAPS = (USB_SINK + ".monitor", BT_SINK + ".monitor")
+
+
+def switch_audio_routing():
+    """
+    Switch audio routing by loading the required loopback modules.
+    """
+    try:
+        for source, sink in ((BT_SOURCE, USB_SINK), (USB_SOURCE, BT_SINK)):
+            subprocess.run(["pactl", "load-module", "module-loopback", f"source={source}",
+                            f"sink={sink}", f"latency_msec={LOOPBACK_LATENCY_MSEC}"], check=True)
+        print("Audio routing switched successfully.")
+    except (subprocess.CalledProcessError, OSError) as e:
+        print("Error switching audio routing:", e)
+
+
+def delete_all_routings():
+    """
+    Delete all loopback routings by unloading modules containing 'module-loopback'.
+    """
+    try:
+        modules = subprocess.run(["pactl", "list", "short", "modules"], check=True,
+                                 capture_output=True, text=True).stdout
+        for line in modules.splitlines():
+            fields = line.split()
+            if len(fields) > 1 and fields[1] == "module-loopback":
+                subprocess.run(["pactl", "unload-module", fields[0]], check=True)
+        print("Deleted all loopback routings.")
+    except (subprocess.CalledProcessError, OSError) as e:
+        print("Error deleting all routings:", e)
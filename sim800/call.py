@@ -0,0 +1,240 @@
+import re
+import threading
+import time
+
+CALL_END_RESULTS = ("NO CARRIER", "BUSY", "NO ANSWER", "NO DIALTONE")
+CLCC_ACTIVE = 0         # +CLCC status of a connected call (the callee answered)
+CLCC_DISCONNECT = 6     # +CLCC status of a call that has just ended
+CLCC_GRACE = 0.05       # Wait this long after a +CLCC disconnect for NO CARRIER/BUSY to name the reason
+RING_TIMEOUT = 8.0      # An unanswered call is missed once RING (repeated every few seconds) stops
+
+
+class CallManager:
+    """
+    Track the modem's voice call state from commands and unsolicited codes.
+
+    States: "idle", "dialing" (until the callee answers), "incoming" (RING
+    seen), "active".
+    Listeners registered with add_listener(callback) are called as
+    callback(event, manager) for "incoming", "ring" (every RING, with
+    ring_count), "dialing", "active" and "ended".
+    An incoming call that stops ringing unanswered ends with reason "missed".
+    """
+
+    def __init__(self, at):
+        self.at = at
+        self.state = "idle"
+        self.number = None
+        self.direction = None
+        self.end_reason = None
+        self.ring_started = None
+        self.ring_count = 0
+        self.ring_timer = None
+        self.call_reports = False
+        self.clcc_timer = None
+        self.generation = 0      # Bumped for every new call, so a late timer cannot end the next one
+        self.ended = threading.Event()
+        self.ended.set()
+        self.listeners = []
+        self.lock = threading.Lock()
+        at.on_urc("RING", self._on_ring)
+        at.on_urc("+CLIP:", self._on_clip)
+        at.on_urc("+CLCC:", self._on_clcc)
+        for result in CALL_END_RESULTS:
+            at.on_urc(result, self._on_call_end)
+
+    @property
+    def active(self):
+        return self.state == "active"
+
+    @property
+    def in_call(self):
+        """
+        True while a call is being dialed or is connected, i.e. can be hung up.
+        """
+        return self.state in ("dialing", "active")
+
+    @property
+    def incoming(self):
+        return self.state == "incoming"
+
+    def add_listener(self, callback):
+        self.listeners.append(callback)
+
+    def _notify(self, event):
+        for callback in list(self.listeners):
+            try:
+                callback(event, self)
+            except Exception as e:
+                print(f"Error in call listener for {event}:", e)
+
+    def _set_state(self, state, event=None):
+        with self.lock:
+            self.state = state
+        if event:
+            self._notify(event)
+
+    # --- Commands ---
+
+    def enable_caller_id(self):
+        """
+        Ask the modem to follow each RING with +CLIP carrying the caller's number.
+        """
+        self.at.command("AT+CLIP=1")
+
+    def enable_call_reports(self):
+        """
+        Ask the modem to report every call status change as a +CLCC line, so a
+        call that ends without a final result code is still noticed.
+        """
+        self.at.command("AT+CLCC=1")
+        self.call_reports = True
+
+    def dial(self, number):
+        """
+        Start a voice call. Returns True if the modem accepted the dial command.
+        ATD returns OK as soon as dialing starts, so the call stays "dialing"
+        until +CLCC reports it connected and only then becomes "active".
+        """
+        if not self.call_reports:
+            self.enable_call_reports()
+        self._cancel_clcc_timer()
+        self.generation += 1
+        self.number = number
+        self.direction = "outgoing"
+        self.end_reason = None
+        self.ended.clear()
+        self._set_state("dialing", "dialing")
+        lines = self.at.command(f"ATD{number};", timeout=20, check=False)
+        result = lines[-1] if lines else "OK"
+        if result in CALL_END_RESULTS or result == "ERROR" or result.startswith("+CME ERROR"):
+            self._end(result)
+            return False
+        return True
+
+    def answer(self):
+        """
+        Answer the incoming call. Returns False if there is none or ATA fails.
+        """
+        if self.state != "incoming":
+            return False
+        lines = self.at.command("ATA", timeout=20, check=False)
+        if lines and lines[-1] != "OK" and not lines[-1].startswith("CONNECT"):
+            self._end(lines[-1])
+            return False
+        if self.ring_timer is not None:
+            self.ring_timer.cancel()
+        self.direction = "incoming"
+        self._set_state("active", "active")
+        return True
+
+    def hang_up(self, reason="hangup"):
+        """
+        Hang up whatever call is in progress.
+        """
+        try:
+            self.at.command("ATH", timeout=20, check=False)
+        finally:
+            self._end(reason)
+
+    def wait_end(self, timeout=None):
+        """
+        Wait until the call ends. Returns True if it ended within timeout.
+        """
+        return self.ended.wait(timeout)
+
+    # --- Unsolicited codes ---
+
+    def _on_ring(self, line):
+        if self.state in ("idle", "incoming"):
+            first = self.state == "idle"
+            if first:
+                # Reset the call before it becomes visible as "incoming"
+                self._cancel_clcc_timer()
+                self.generation += 1
+                self.number = None
+                self.end_reason = None
+                self.ring_started = time.monotonic()
+                self.ring_count = 0
+                self.ended.clear()
+            with self.lock:
+                self.state = "incoming"
+                self.direction = "incoming"
+            if self.ring_timer is not None:
+                self.ring_timer.cancel()
+            self.ring_timer = threading.Timer(RING_TIMEOUT, self._on_ring_timeout)
+            self.ring_timer.daemon = True
+            self.ring_timer.start()
+            if first:
+                print("Incoming call detected!")
+                self._notify("incoming")
+            self.ring_count += 1
+            self._notify("ring")
+
+    def _on_ring_timeout(self):
+        if self.state == "incoming":
+            self._end("missed")
+
+    def _on_clip(self, line):
+        match = re.match(r'\+CLIP: "([^"]*)"', line)
+        if match and self.state == "incoming":
+            self.number = match.group(1)
+
+    def _on_clcc(self, line):
+        match = re.match(r'\+CLCC: \d+,(\d+),(\d+),\d+,\d+(?:,"([^"]*)")?', line)
+        if not match or self.state == "idle":
+            return
+        outgoing, status, number = match.group(1) == "0", int(match.group(2)), match.group(3)
+        if number and self.number and not (number.endswith(self.number[-9:]) or self.number.endswith(number[-9:])):
+            return  # Some other call (e.g. a waiting one) changed
+        if status == CLCC_ACTIVE:
+            if outgoing and self.state == "dialing":
+                self._set_state("active", "active")
+            return
+        if status != CLCC_DISCONNECT:
+            return
+        self._cancel_clcc_timer()
+        self.clcc_timer = threading.Timer(CLCC_GRACE, self._on_clcc_timeout, args=(self.generation,))
+        self.clcc_timer.daemon = True
+        self.clcc_timer.start()
+
+    def _on_clcc_timeout(self, generation):
+        if generation == self.generation:
+            self._on_call_end("disconnected")
+
+    def _cancel_clcc_timer(self):
+        if self.clcc_timer is not None:
+            self.clcc_timer.cancel()
+            self.clcc_timer = None
+
+    def _on_call_end(self, line):
+        if self.state != "idle":
+            self._end(line)
+
+    def _end(self, reason):
+        if self.ring_timer is not None:
+            self.ring_timer.cancel()
+        self._cancel_clcc_timer()
+        with self.lock:
+            if self.state == "idle" and self.ended.is_set():
+                return
+            self.state = "idle"
+            self.end_reason = reason
+        self.ended.set()
+        self._notify("ended")
+
+
+def place_call(at, number, max_duration=30):
+    """
+    Dial a number, keep the call up until the far end hangs up or
+    max_duration seconds pass, then hang up. Returns how the call ended.
+    """
+    calls = CallManager(at)
+    print(f"Dialing: {number}")
+    if not calls.dial(number):
+        print(f"Call failed: {calls.end_reason}")
+        return calls.end_reason
+    if not calls.wait_end(max_duration):
+        calls.hang_up("timeout")
+    print(f"Call ended: {calls.end_reason}")
+    return calls.end_reason
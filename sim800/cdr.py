@@ -0,0 +1,162 @@
+"""
+Call detail records in SQLite.
+
+CallLog listens to a CallManager and stores one row per call: when it
+started, direction, number, whether it was answered, setup latency,
+duration and why it ended, plus a transcript added later for voicemail and
+transcribed calls. An incoming call that ends without being answered is a
+missed call. Rows are written on a background thread so the
+serial reader never waits on the SD card, and the most recent calls are
+kept in memory for "redial" and "call back".
+"""
+import queue
+import sqlite3
+import threading
+import time
+from collections import deque
+
+# --- Call Log ---
+CALL_LOG_DATABASE = "calls.db"
+RECENT_CALLS = 20              # Calls kept in memory for redial / call back
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS calls (
+    id INTEGER PRIMARY KEY,
+    started REAL NOT NULL,
+    direction TEXT NOT NULL,
+    number TEXT,
+    answered INTEGER NOT NULL,
+    setup_latency REAL,
+    duration REAL NOT NULL,
+    end_reason TEXT,
+    transcript TEXT
+);
+CREATE INDEX IF NOT EXISTS calls_started ON calls (started);
+CREATE INDEX IF NOT EXISTS calls_number ON calls (number, started);
+"""
+
+COLUMNS = ("started", "direction", "number", "answered", "setup_latency", "duration", "end_reason",
+           "transcript")
+INSERT = f"INSERT INTO calls ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+
+
+class CallLog:
+    """
+    Record every call a CallManager sees. Attach it with attach(calls).
+    """
+
+    def __init__(self, path=CALL_LOG_DATABASE, recent=RECENT_CALLS):
+        self.path = path
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(SCHEMA)
+        if "transcript" not in [row["name"] for row in self.db.execute("PRAGMA table_info(calls)")]:
+            self.db.execute("ALTER TABLE calls ADD COLUMN transcript TEXT")  # Databases from before transcripts
+        self.lock = threading.Lock()
+        self.current = None
+        self.recent = deque(reversed(self.history(limit=recent)), maxlen=recent)
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._write_loop, daemon=True)
+        self.thread.start()
+
+    def attach(self, calls):
+        calls.add_listener(self.on_call_event)
+        return self
+
+    def close(self):
+        """
+        Write out queued records and close the database.
+        """
+        self.queue.put(None)
+        self.thread.join(timeout=5)
+        with self.lock:
+            self.db.close()
+
+    # --- Recording ---
+
+    def on_call_event(self, event, calls):
+        now = time.monotonic()
+        if event == "incoming":
+            self.current = {"started": time.time(), "setup_start": calls.ring_started or now, "connected": None}
+        elif event == "dialing":
+            self.current = {"started": time.time(), "setup_start": now, "connected": None}
+        elif event == "active" and self.current is not None:
+            self.current["connected"] = now
+        elif event == "ended" and self.current is not None:
+            call, self.current = self.current, None
+            connected = call["connected"]
+            record = {
+                "started": call["started"],
+                "direction": calls.direction or "outgoing",
+                "number": calls.number,
+                "answered": int(connected is not None),
+                "setup_latency": connected - call["setup_start"] if connected is not None else None,
+                "duration": now - connected if connected is not None else 0.0,
+                "end_reason": calls.end_reason,
+                "transcript": None,
+            }
+            self.recent.append(record)
+            self.queue.put((INSERT, [record[c] for c in COLUMNS]))
+
+    def current_started(self):
+        """
+        The start time identifying the call in progress, or None.
+        Keep it to attach a transcript once the call has ended.
+        """
+        call = self.current
+        return call["started"] if call is not None else None
+
+    def set_transcript(self, started, text):
+        """
+        Store a transcript with the call that started at `started`.
+        Queued behind the call's own record, so it may be set right after the call ends.
+        """
+        for record in self.recent:
+            if record["started"] == started:
+                record["transcript"] = text
+        self.queue.put(("UPDATE calls SET transcript = ? WHERE started = ?", [text, started]))
+
+    def _write_loop(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            try:
+                with self.lock:
+                    self.db.execute(*item)
+                    self.db.commit()
+            except sqlite3.Error as e:
+                print("Error writing call record:", e)
+
+    # --- Lookups ---
+
+    def last_number(self, direction):
+        """
+        The number of the most recent "outgoing" or "incoming" call, from memory.
+        """
+        for record in reversed(self.recent):
+            if record["direction"] == direction and record["number"]:
+                return record["number"]
+        return None
+
+    def history(self, number=None, since=None, missed=False, limit=50):
+        """
+        Most recent calls first, optionally for one number, after a unix time,
+        or only missed ones. Returns a list of dicts.
+        """
+        where, args = [], []
+        if number is not None:
+            where.append("number = ?")
+            args.append(number)
+        if since is not None:
+            where.append("started >= ?")
+            args.append(since)
+        if missed:
+            where.append("direction = 'incoming' AND answered = 0")
+        sql = f"SELECT {', '.join(COLUMNS)} FROM calls"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY started DESC LIMIT ?"
+        with self.lock:
+            rows = self.db.execute(sql, args + [limit]).fetchall()
+        return [dict(row) for row in rows]
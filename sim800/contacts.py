@@ -0,0 +1,46 @@
+import os
+
+# --- Local Contact Store ---
+CONTACTS_FILE = "saved_numbers.txt"   # One "name,number" per line, appended by voice saves
+
+
+def load_contacts(path=CONTACTS_FILE):
+    """
+    Read the contact file into an ordered {name: number} dict.
+    Later lines win, so re-saving a name updates it.
+    """
+    contacts = {}
+    try:
+        with open(path) as f:
+            for line in f:
+                name, sep, number = line.strip().rpartition(",")
+                if sep and name and number:
+                    contacts[name] = number
+    except FileNotFoundError:
+        pass
+    return contacts
+
+
+def save_contact(name, number, path=CONTACTS_FILE):
+    """
+    Save the name and phone number pair to a text file.
+    Appends to 'saved_numbers.txt' in the current directory by default.
+    """
+    try:
+        with open(path, "a") as f:
+            f.write(f"{name},{number}\n")
+        print(f"Saved contact: {name} -> {number}")
+    except Exception as e:
+        print("Error saving contact:", e)
+
+
+def write_contacts(contacts, path=CONTACTS_FILE):
+    """
+    Replace the contact file with the given {name: number} dict.
+    Written to a temporary file first so a crash never leaves it half written.
+    """
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        for name, number in contacts.items():
+            f.write(f"{name},{number}\n")
+    os.replace(tmp, path)
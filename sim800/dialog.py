@@ -0,0 +1,128 @@
+import re
+
+ANY = "*"              # Pseudo-state whose handlers apply in every state
+FALLBACK = None        # Intent used when nothing in the utterance matches
+
+
+class Utterance:
+    """
+    One recognized utterance as seen by a handler.
+    """
+
+    def __init__(self, text, words=None, intent=FALLBACK):
+        self.text = text
+        self.words = words if words is not None else [(w, 1.0) for w in text.split()]
+        self.intent = intent
+
+
+class KeywordMatcher:
+    """
+    Map keywords and two-word phrases to intents through a dict index,
+    so matching costs one lookup per token instead of one scan per phrase.
+    """
+
+    def __init__(self, phrases=None):
+        self.index = {}
+        for phrase, intent in (phrases or {}).items():
+            self.add(phrase, intent)
+
+    def add(self, phrase, intent):
+        """
+        Register a phrase of one or two words for an intent.
+        """
+        key = tuple(phrase.lower().split())
+        if len(key) not in (1, 2):
+            raise ValueError(f"Phrases must be one or two words: {phrase!r}")
+        self.index[key] = intent
+
+    def match(self, text):
+        """
+        Return the intents found in the text, in the order they were spoken.
+        Two-word phrases take precedence over their first word.
+        """
+        tokens = [re.sub(r"[^\w]", "", t) for t in text.lower().split()]
+        intents = []
+        i = 0
+        while i < len(tokens):
+            pair = tuple(tokens[i:i + 2])
+            if len(pair) == 2 and pair in self.index:
+                intents.append(self.index[pair])
+                i += 2
+                continue
+            if (tokens[i],) in self.index:
+                intents.append(self.index[(tokens[i],)])
+            i += 1
+        return intents
+
+
+class Dialog:
+    """
+    Table-driven dialog: handlers are registered per (state, intent) and an
+    utterance is dispatched with dict lookups on the current state.
+    Handlers take (dialog, utterance) and return the next state, or None to stay.
+    """
+
+    def __init__(self, matcher=None, initial_state="idle"):
+        self.matcher = matcher if matcher is not None else KeywordMatcher()
+        self.state = initial_state
+        self.initial_state = initial_state
+        self.table = {}
+        self.context = {}
+
+    def register(self, state, intent, handler):
+        """
+        Register a handler for an intent in a state (ANY for every state,
+        intent FALLBACK for utterances with no handled intent).
+        """
+        self.table.setdefault(state, {})[intent] = handler
+
+    def on(self, state, intent=FALLBACK):
+        """
+        Decorator form of register().
+        """
+        def decorator(handler):
+            self.register(state, intent, handler)
+            return handler
+        return decorator
+
+    def add_phrase(self, phrase, intent):
+        """
+        Teach the matcher a new phrase for an intent.
+        """
+        self.matcher.add(phrase, intent)
+
+    def resolve(self, intents):
+        """
+        Find the handler for the first intent the current state knows,
+        falling back to ANY and then to the state's FALLBACK handler.
+        """
+        state_table = self.table.get(self.state, {})
+        any_table = self.table.get(ANY, {})
+        for intent in intents:
+            handler = state_table.get(intent) or any_table.get(intent)
+            if handler is not None:
+                return intent, handler
+        handler = state_table.get(FALLBACK) or any_table.get(FALLBACK)
+        return FALLBACK, handler
+
+    def handle(self, text, words=None):
+        """
+        Dispatch one utterance. Returns True if a handler ran.
+        """
+        text = text.lower().strip()
+        if not text:
+            return False
+        intent, handler = self.resolve(self.matcher.match(text))
+        if handler is None:
+            return False
+        next_state = handler(self, Utterance(text, words, intent))
+        if next_state is not None:
+            self.state = next_state
+        return True
+
+    def reset(self):
+        """
+        Return to the initial state and drop the context.
+        """
+        self.state = self.initial_state
+        self.context = {}
@@ -0,0 +1,11 @@
+DTMF_DIGITS = set("0123456789*#ABCD")
+
+
+def send_dtmf(at, digits):
+    """
+    Send DTMF tones during an active call, one AT+VTS per digit.
+    """
+    for digit in digits.upper():
+        if digit not in DTMF_DIGITS:
+            raise ValueError(f"Not a DTMF digit: {digit!r}")
+        at.command(f"AT+VTS={digit}", timeout=5)
@@ -0,0 +1,194 @@
+"""
+Keep the assistant from hearing itself.
+
+EchoGate stops recognition while a prompt plays (and for a short hangover
+after it), so "Calling number ..." coming out of the speaker never reaches
+the recognizer. EchoCanceller removes the far end of a call from the mic
+with a partitioned-block frequency-domain NLMS filter, using the audio sent
+to the speaker as the reference; ReferenceTap reads that reference from the
+sink's PulseAudio monitor.
+"""
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+from sim800.audio_routing import USB_SINK
+
+# --- Echo Control Configuration ---
+ECHO_HANGOVER = 0.3            # Seconds to keep gating after playback stops (output buffers, room reverb)
+REFERENCE_TAP = USB_SINK + ".monitor"  # Where the far end of a call is played
+AEC_BLOCK = 256                # Filter block (16 ms)
+AEC_PARTITIONS = 8             # Filter length = 8 blocks (128 ms of echo path)
+AEC_STEP = 0.5                 # NLMS step size
+AEC_DOUBLE_TALK = 0.6          # Freeze adaptation when the mic peak exceeds this fraction of the recent reference peak
+REFERENCE_MAX_LAG = 8000       # Samples the reference may run ahead before the oldest are dropped
+
+
+class EchoGate:
+    """
+    Track when the assistant is making sound itself. Wrap blocking prompts
+    in `with gate.playing():`, register non-blocking players with
+    add_source(is_playing), and ask gated(captured_at) before recognizing a
+    block captured at that (monotonic) time.
+    """
+
+    def __init__(self, hangover=ECHO_HANGOVER, clock=time.monotonic):
+        self.hangover = hangover
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.active = 0
+        self.quiet_since = float("-inf")
+        self.sources = []
+
+    def add_source(self, is_playing):
+        self.sources.append(is_playing)
+
+    def begin(self):
+        with self.lock:
+            self.active += 1
+
+    def end(self):
+        with self.lock:
+            self.active = max(0, self.active - 1)
+            self.quiet_since = self.clock()
+
+    @contextmanager
+    def playing(self):
+        self.begin()
+        try:
+            yield
+        finally:
+            self.end()
+
+    def gated(self, captured_at=None):
+        """
+        True if audio captured at captured_at (default: now) may contain our own playback.
+        """
+        now = self.clock()
+        if self.active or any(is_playing() for is_playing in self.sources):
+            self.quiet_since = now
+            return True
+        return (captured_at if captured_at is not None else now) < self.quiet_since + self.hangover
+
+
+class EchoCanceller:
+    """
+    Partitioned-block frequency-domain adaptive filter (overlap-save,
+    constrained gradient) estimating the echo of the reference in the mic
+    signal and subtracting it. process() takes and returns int16 bytes of the
+    same length; the output lags the input by one filter block.
+    """
+
+    def __init__(self, block=AEC_BLOCK, partitions=AEC_PARTITIONS, step=AEC_STEP,
+                 double_talk=AEC_DOUBLE_TALK):
+        self.block = block
+        self.step = step
+        self.double_talk = double_talk
+        bins = block + 1
+        self.X = np.zeros((partitions, bins), dtype=np.complex64)
+        self.W = np.zeros((partitions, bins), dtype=np.complex64)
+        self.power = np.full(bins, 1.0, dtype=np.float32)
+        self.ref_prev = np.zeros(block, dtype=np.float32)
+        self.ref_peaks = np.zeros(partitions, dtype=np.float32)
+        self.mic_buf = np.zeros(0, dtype=np.float32)
+        self.ref_buf = np.zeros(0, dtype=np.float32)
+        self.out_buf = np.zeros(block, dtype=np.float32)
+
+    def process(self, mic, reference):
+        d = np.frombuffer(mic, dtype="<i2").astype(np.float32)
+        x = np.frombuffer(reference, dtype="<i2").astype(np.float32)
+        if len(x) < len(d):
+            x = np.concatenate((x, np.zeros(len(d) - len(x), dtype=np.float32)))
+        self.mic_buf = np.concatenate((self.mic_buf, d))
+        self.ref_buf = np.concatenate((self.ref_buf, x[:len(d)]))
+        count = len(self.mic_buf) // self.block
+        out = [self.out_buf]
+        for i in range(count):
+            span = slice(i * self.block, (i + 1) * self.block)
+            out.append(self._filter_block(self.mic_buf[span], self.ref_buf[span]))
+        self.mic_buf = self.mic_buf[count * self.block:]
+        self.ref_buf = self.ref_buf[count * self.block:]
+        produced = np.concatenate(out)
+        result, self.out_buf = produced[:len(d)], produced[len(d):]
+        return np.clip(result, -32768, 32767).astype("<i2").tobytes()
+
+    def _filter_block(self, d, x):
+        B = self.block
+        self.X[1:] = self.X[:-1]
+        self.X[0] = np.fft.rfft(np.concatenate((self.ref_prev, x)))
+        self.ref_prev = x
+        self.ref_peaks[1:] = self.ref_peaks[:-1]
+        self.ref_peaks[0] = np.abs(x).max()
+
+        echo = np.fft.irfft((self.W * self.X).sum(axis=0), n=2 * B)[B:]
+        e = d - echo
+
+        self.power = 0.9 * self.power + 0.1 * (np.abs(self.X[0]) ** 2)
+        peak = self.ref_peaks.max()
+        if peak > 0 and np.abs(d).max() < self.double_talk * peak:
+            E = np.fft.rfft(np.concatenate((np.zeros(B, dtype=np.float32), e)))
+            mu = self.step / (len(self.W) * self.power + 1e-6)
+            gradient = np.fft.irfft(np.conj(self.X) * (E * mu)[None, :], n=2 * B, axis=1)
+            gradient[:, B:] = 0
+            self.W += np.fft.rfft(gradient, axis=1).astype(np.complex64)
+        return e.astype(np.float32)
+
+
+class ReferenceTap:
+    """
+    Read what is being played into a sink from its PulseAudio monitor with
+    parec, buffered so read(n) can hand the echo canceller reference blocks
+    in step with the mic.
+    """
+
+    def __init__(self, device=REFERENCE_TAP, rate=16000, max_lag=REFERENCE_MAX_LAG):
+        self.device = device
+        self.rate = rate
+        self.max_lag = max_lag
+        self.buffer = b""
+        self.lock = threading.Lock()
+        self.proc = None
+        self.thread = None
+
+    def start(self):
+        cmd = ["parec", f"--device={self.device}", "--format=s16le", f"--rate={self.rate}",
+               "--channels=1", "--raw", "--latency-msec=20"]
+        self.proc = subprocess.Popen(cmd, stdout=subprocess.PIPE)
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        if self.proc is not None:
+            self.proc.terminate()
+            try:
+                self.proc.wait(timeout=1)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+            self.proc = None
+
+    def read(self, frames):
+        """
+        The next `frames` reference samples as int16 bytes, zero-padded if the
+        tap has fallen behind; samples beyond max_lag ahead are dropped.
+        """
+        size = frames * 2
+        with self.lock:
+            excess = len(self.buffer) - size - self.max_lag * 2
+            excess -= excess % 2
+            if excess > 0:
+                self.buffer = self.buffer[excess:]
+            data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data + bytes(size - len(data))
+
+    def _run(self):
+        stdout = self.proc.stdout
+        while True:
+            data = stdout.read1(3200)
+            if not data:
+                break
+            with self.lock:
+                self.buffer += data
@@ -0,0 +1,245 @@
+import re
+
+# --- Number Entry Configuration ---
+COUNTRY_CODE = "+995"          # Prepended to national numbers when dialing
+NATIONAL_LENGTH = 9            # Digits in a national number; entry completes automatically
+MAX_INTERNATIONAL_LENGTH = 15  # E.164 limit, country code included
+MIN_CONFIDENCE = 0.6           # Vosk word confidence below which a group is rejected
+
+DIGIT_WORDS = {
+    "zero": "0", "oh": "0", "o": "0",
+    "one": "1", "two": "2", "three": "3", "four": "4", "five": "5",
+    "six": "6", "seven": "7", "eight": "8", "nine": "9"
+}
+
+TEEN_WORDS = {
+    "ten": "10", "eleven": "11", "twelve": "12", "thirteen": "13", "fourteen": "14",
+    "fifteen": "15", "sixteen": "16", "seventeen": "17", "eighteen": "18", "nineteen": "19"
+}
+
+TENS_WORDS = {
+    "twenty": "2", "thirty": "3", "forty": "4", "fifty": "5",
+    "sixty": "6", "seventy": "7", "eighty": "8", "ninety": "9"
+}
+
+REPEAT_WORDS = {"double": 2, "triple": 3}
+
+COMMAND_WORDS = {
+    "correction": "correction",
+    "back": "back",
+    "repeat": "repeat",
+    "clear": "clear",
+    "done": "done",
+    "dial": "done",
+    "plus": "plus"
+}
+
+
+def words_from_result(result):
+    """
+    Extract (word, confidence) pairs from a Vosk result dict.
+    Uses the word list produced by SetWords(True) when present,
+    otherwise falls back to the plain text with full confidence.
+    """
+    if result.get("result"):
+        return [(w.get("word", ""), w.get("conf", 1.0)) for w in result["result"]]
+    return [(w, 1.0) for w in result.get("text", "").split()]
+
+
+def tokenize(words):
+    """
+    Turn (word, confidence) pairs into tokens.
+    Each token is ("digits", "55", conf) or ("command", "back", conf);
+    words that are neither numbers nor commands are dropped.
+    """
+    words = [(re.sub(r"[^\w]", "", w.lower()), c) for w, c in words]
+    words = [(w, c) for w, c in words if w]
+    tokens = []
+    i = 0
+    while i < len(words):
+        word, conf = words[i]
+        nxt = words[i + 1] if i + 1 < len(words) else (None, 1.0)
+
+        if word in REPEAT_WORDS and nxt[0] in DIGIT_WORDS:
+            tokens.append(("digits", DIGIT_WORDS[nxt[0]] * REPEAT_WORDS[word], min(conf, nxt[1])))
+            i += 2
+        elif word in DIGIT_WORDS and nxt[0] == "hundred":
+            digits, used, group_conf = DIGIT_WORDS[word], 2, min(conf, nxt[1])
+            after = words[i + 2] if i + 2 < len(words) else (None, 1.0)
+            if after[0] in TENS_WORDS or after[0] in TEEN_WORDS:
+                rest, extra, rest_conf = _two_digit_group(words, i + 2)
+                digits += rest
+                used += extra
+                group_conf = min(group_conf, rest_conf)
+            elif after[0] in DIGIT_WORDS:
+                digits += "0" + DIGIT_WORDS[after[0]]
+                used += 1
+                group_conf = min(group_conf, after[1])
+            else:
+                digits += "00"
+            tokens.append(("digits", digits, group_conf))
+            i += used
+        elif word in TENS_WORDS or word in TEEN_WORDS:
+            digits, used, group_conf = _two_digit_group(words, i)
+            tokens.append(("digits", digits, group_conf))
+            i += used
+        elif word in DIGIT_WORDS:
+            tokens.append(("digits", DIGIT_WORDS[word], conf))
+            i += 1
+        elif word.isdigit():
+            tokens.append(("digits", word, conf))
+            i += 1
+        elif word in COMMAND_WORDS:
+            tokens.append(("command", COMMAND_WORDS[word], conf))
+            i += 1
+        else:
+            i += 1
+    return tokens
+
+
+def _two_digit_group(words, i):
+    """
+    Parse "fifty five", "fifty" or "fifteen" starting at words[i].
+    Returns (digits, words used, confidence).
+    """
+    word, conf = words[i]
+    if word in TEEN_WORDS:
+        return TEEN_WORDS[word], 1, conf
+    nxt = words[i + 1] if i + 1 < len(words) else (None, 1.0)
+    if nxt[0] in DIGIT_WORDS and DIGIT_WORDS[nxt[0]] != "0":
+        return TENS_WORDS[word] + DIGIT_WORDS[nxt[0]], 2, min(conf, nxt[1])
+    return TENS_WORDS[word] + "0", 1, conf
+
+
+def parse_digits(text):
+    """
+    Convert a spoken phrase to its digits, ignoring commands and other words.
+    """
+    return "".join(t[1] for t in tokenize([(w, 1.0) for w in text.split()]) if t[0] == "digits")
+
+
+def spell(digits):
+    """
+    Spell digits one by one for text to speech.
+    """
+    return " ".join(digits)
+
+
+class NumberEntry:
+    """
+    Accumulate a phone number over several utterances.
+    Each utterance's digits form a group that can be read back or removed
+    with "correction"; "back" removes the last digit, "repeat" reads the
+    number back, "clear" starts over, and "plus" (or a leading 00) marks
+    an international number, which is finished with "done" or "dial".
+    """
+
+    def __init__(self, country_code=COUNTRY_CODE, national_length=NATIONAL_LENGTH,
+                 min_confidence=MIN_CONFIDENCE):
+        self.country_code = country_code
+        self.national_length = national_length
+        self.min_confidence = min_confidence
+        self.groups = []
+        self.international = False
+        self.complete = False
+
+    @property
+    def digits(self):
+        return "".join(self.groups)
+
+    def readback(self):
+        """
+        Read back the entered digits group by group.
+        """
+        prefix = "plus, " if self.international else ""
+        if not self.groups:
+            return prefix + "no digits yet"
+        return prefix + ", ".join(spell(g) for g in self.groups if g)
+
+    def number(self):
+        """
+        The number as stored in contacts: national digits, or +digits if international.
+        """
+        digits = self.digits
+        if self.international:
+            return "+" + (digits[2:] if digits.startswith("00") else digits)
+        return digits
+
+    def full_number(self):
+        """
+        The number ready for ATD, with the default country code for national numbers.
+        """
+        number = self.number()
+        return number if number.startswith("+") else self.country_code + number
+
+    def feed(self, words):
+        """
+        Process one utterance given as (word, confidence) pairs.
+        Returns the text to speak back to the user, or "" if nothing needs saying.
+        Check .complete afterwards to see whether the number is ready.
+        """
+        group = ""
+        for kind, value, conf in tokenize(words):
+            if kind == "digits":
+                if conf < self.min_confidence:
+                    if group:
+                        self._add_group(group)
+                    return "I did not catch that. Please repeat the last digits. So far: " + self.readback()
+                group += value
+                continue
+
+            if group:
+                self._add_group(group)
+                group = ""
+            if value == "plus" and not self.digits:
+                self.international = True
+            elif value == "correction":
+                if self.groups:
+                    self.groups.pop()
+                return "Removed the last digits. So far: " + self.readback()
+            elif value == "back":
+                if self.groups:
+                    self.groups[-1] = self.groups[-1][:-1]
+                    if not self.groups[-1]:
+                        self.groups.pop()
+                return "So far: " + self.readback()
+            elif value == "repeat":
+                return self.readback()
+            elif value == "clear":
+                self.groups = []
+                self.international = False
+                return "Cleared. Tell me number"
+            elif value == "done":
+                return self._finish()
+
+        if group:
+            self._add_group(group)
+        return self._check_length()
+
+    def _add_group(self, group):
+        self.groups.append(group)
+        if not self.international and self.digits.startswith("00"):
+            self.international = True
+
+    def _check_length(self):
+        length = len(self.digits)
+        if self.international:
+            if len(self.number()) - 1 >= MAX_INTERNATIONAL_LENGTH:
+                return self._finish()
+            return ""
+        if length == self.national_length:
+            self.complete = True
+            return ""
+        if length > self.national_length:
+            return (f"That is {length} digits, {self.national_length} expected. "
+                    "Say correction or back. So far: " + self.readback())
+        return ""
+
+    def _finish(self):
+        digits = self.number().lstrip("+")
+        if self.international and len(digits) < 4:
+            return "The international number is too short. So far: " + self.readback()
+        if not self.international and len(digits) != self.national_length:
+            return f"I need {self.national_length} digits. So far: " + self.readback()
+        self.complete = True
+        return ""
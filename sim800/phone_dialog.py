@@ -0,0 +1,118 @@
+import re
+
+from sim800.dialog import ANY, FALLBACK, Dialog, KeywordMatcher
+from sim800.number_parser import NumberEntry, spell
+
+# Phrases the matcher recognizes, mapped to intents
+PHONE_PHRASES = {
+    "call": "call",
+    "redial": "redial",
+    "call back": "call_back",
+    "save number": "save_number",
+    "yes": "answer",
+    "hang up": "hang_up",
+    "done": "done",
+    "save": "done"
+}
+
+
+def build_phone_dialog(actions):
+    """
+    Build the voice assistant dialog on top of an actions object providing
+    speak(text), dial(number), answer(), hang_up(), save_contact(name, number)
+    and last_number(direction) ("outgoing" or "incoming", None if there is none).
+    answer() and hang_up() return False when there is no call to act on.
+    Everything else lives in the dialog, so it can be driven by text alone.
+    """
+    dialog = Dialog(KeywordMatcher(PHONE_PHRASES))
+
+    def start_call(d, u):
+        d.context["entry"] = NumberEntry()
+        actions.speak("Tell me number")
+        return "dial_number"
+
+    def collect_dial_digits(d, u):
+        entry = d.context["entry"]
+        reply = entry.feed(u.words)
+        print(f"Accumulated digits (call): {entry.number()}")
+        if entry.complete:
+            number = entry.full_number()
+            print(f"Final phone number: {number}")
+            actions.speak("Calling number " + entry.readback())
+            actions.dial(number)
+            d.context.pop("entry", None)
+            return "idle"
+        if reply:
+            actions.speak(reply)
+        return None
+
+    def dial_recent(direction, missing):
+        def handler(d, u):
+            number = actions.last_number(direction)
+            if not number:
+                actions.speak(missing)
+            else:
+                actions.speak("Calling number " + spell(number.lstrip("+")))
+                actions.dial(number)
+            d.context.pop("entry", None)
+            return "idle"
+        return handler
+
+    def start_save(d, u):
+        d.context["entry"] = NumberEntry()
+        actions.speak("Please say the number")
+        return "save_number"
+
+    def collect_save_digits(d, u):
+        entry = d.context["entry"]
+        reply = entry.feed(u.words)
+        print(f"Accumulated digits (save): {entry.number()}")
+        if entry.complete:
+            actions.speak("Number recorded. Now please spell the name letter by letter. Say 'done' when finished.")
+            d.context["name"] = ""
+            return "save_name"
+        if reply:
+            actions.speak(reply)
+        return None
+
+    def collect_letters(d, u):
+        for token in u.text.split():
+            token_clean = re.sub(r'[^\w]', '', token)
+            if token_clean.isalpha() and len(token_clean) == 1:
+                d.context["name"] += token_clean.upper()
+        actions.speak("Accumulated letters: " + " ".join(d.context["name"]))
+        return None
+
+    def finish_save(d, u):
+        name = d.context.get("name", "")
+        if name:
+            actions.save_contact(name, d.context["entry"].number())
+            actions.speak("Number saved successfully.")
+        else:
+            actions.speak("No letters were detected. Please try again.")
+        d.context.clear()
+        return "idle"
+
+    def answer(d, u):
+        if not actions.answer():
+            actions.speak("No incoming call to answer")
+        return None
+
+    def hang_up(d, u):
+        if not actions.hang_up():
+            actions.speak("No active call to hang up")
+        return None
+
+    dialog.register("idle", "call", start_call)
+    dialog.register("dial_number", "call", start_call)
+    dialog.register("dial_number", FALLBACK, collect_dial_digits)
+    for state in ("idle", "dial_number"):
+        dialog.register(state, "redial", dial_recent("outgoing", "No number to redial"))
+        dialog.register(state, "call_back", dial_recent("incoming", "No recent caller to call back"))
+    dialog.register("save_number", FALLBACK, collect_save_digits)
+    dialog.register("save_name", "done", finish_save)
+    dialog.register("save_name", FALLBACK, collect_letters)
+    dialog.register(ANY, "save_number", start_save)
+    dialog.register(ANY, "answer", answer)
+    dialog.register(ANY, "hang_up", hang_up)
+    return dialog
@@ -0,0 +1,200 @@
+"""
+Two-way sync between the SIM phonebook and the local contact file.
+
+The whole phonebook is read with one ranged AT+CPBR instead of one command
+per slot, every entry on both sides is reduced to a content hash, and only
+entries whose hash changed since the last sync are written back with
+AT+CPBW (or copied into saved_numbers.txt). A sync with nothing to do costs
+four AT commands, so it is cheap enough to run at every startup.
+
+The sync state is tied to the SIM's ICCID. A SIM it has not seen before (or
+whose ICCID cannot be read) is merged with the contact file without deleting
+anything on either side, and deletions are never copied from a side that has
+dropped to empty, so a swapped SIM or a phonebook that reads as empty during
+boot cannot wipe the contacts.
+"""
+import hashlib
+import json
+import re
+
+from sim800.contacts import CONTACTS_FILE, load_contacts, write_contacts
+
+# --- Phonebook Sync ---
+PHONEBOOK_STORAGE = "SM"                      # SIM card phonebook
+SYNC_STATE_FILE = "phonebook_sync.json"       # Hashes from the last sync, next to the contact file
+READ_TIMEOUT_PER_ENTRY = 0.05                 # Extra AT+CPBR timeout per slot on top of 5 s
+
+NUMBER_TYPE_INTERNATIONAL = 145
+NUMBER_TYPE_NATIONAL = 129
+
+
+def entry_hash(name, number):
+    """
+    Short content hash of one contact, used to spot changes on either side.
+    """
+    return hashlib.sha1(f"{name}\x1f{number}".encode()).hexdigest()[:16]
+
+
+def sim_iccid(at):
+    """
+    The SIM's ICCID from AT+CCID, or None if it cannot be read.
+    """
+    try:
+        lines = at.command("AT+CCID")
+    except Exception as e:
+        print("Could not read the SIM's ICCID:", e)
+        return None
+    for line in lines:
+        value = line.split(":", 1)[-1].strip().strip('"')
+        if re.fullmatch(r"[0-9A-Fa-f]{18,22}", value):
+            return value
+    return None
+
+
+def phonebook_limits(at):
+    """
+    Select the SIM phonebook and return (first, last, number_length, name_length, used)
+    from AT+CPBR=? and AT+CPBS?.
+    """
+    at.command(f'AT+CPBS="{PHONEBOOK_STORAGE}"')
+    match = re.match(r"\((\d+)-(\d+)\),(\d+),(\d+)", at.query("AT+CPBR=?") or "")
+    if not match:
+        raise ValueError("Unexpected AT+CPBR=? response")
+    first, last, number_length, name_length = (int(v) for v in match.groups())
+    used = re.match(r'"[^"]*",(\d+)', at.query("AT+CPBS?") or "")
+    return first, last, number_length, name_length, int(used.group(1)) if used else None
+
+
+def parse_cpbr(lines):
+    """
+    Parse AT+CPBR response lines into {index: (name, number)}.
+    """
+    entries = {}
+    for line in lines:
+        match = re.match(r'\+CPBR: (\d+),"([^"]*)",(\d+),"([^"]*)"', line)
+        if match:
+            index, number, _, name = match.groups()
+            entries[int(index)] = (name, number)
+    return entries
+
+
+def read_phonebook(at, first, last):
+    """
+    Read every used slot between first and last with a single ranged AT+CPBR.
+    """
+    timeout = 5.0 + (last - first + 1) * READ_TIMEOUT_PER_ENTRY
+    return parse_cpbr(at.command(f"AT+CPBR={first},{last}", timeout=timeout))
+
+
+def write_entry(at, index, name, number):
+    """
+    Store one entry in a SIM slot (AT+CPBW).
+    """
+    number_type = NUMBER_TYPE_INTERNATIONAL if number.startswith("+") else NUMBER_TYPE_NATIONAL
+    at.command(f'AT+CPBW={index},"{number}",{number_type},"{name}"')
+
+
+def delete_entry(at, index):
+    """
+    Clear one SIM slot (AT+CPBW with only the index).
+    """
+    at.command(f"AT+CPBW={index}")
+
+
+def load_sync_state(path=SYNC_STATE_FILE):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_sync_state(state, path=SYNC_STATE_FILE):
+    try:
+        with open(path, "w") as f:
+            json.dump(state, f, indent=1, sort_keys=True)
+    except OSError as e:
+        print("Could not save phonebook sync state:", e)
+
+
+def sim_name(name, name_length):
+    """
+    The name as the SIM can store it: no quotes, cut to the SIM's name length.
+    """
+    return name.replace('"', "").strip()[:name_length]
+
+
+def sync_phonebook(at, contacts_file=CONTACTS_FILE, state_file=SYNC_STATE_FILE):
+    """
+    Bring the SIM phonebook and the contact file in line with each other.
+
+    An entry that changed on one side since the last sync is copied to the
+    other; an entry deleted on one side is deleted on the other; if both
+    sides changed the local contact wins. Contacts are matched by name.
+    On the first sync with a SIM both sides are merged and nothing is deleted.
+    Returns a dict counting what was done.
+    """
+    iccid = sim_iccid(at)
+    first, last, number_length, name_length, used = phonebook_limits(at)
+    sim = read_phonebook(at, first, last) if used != 0 else {}
+    sim_by_name = {}
+    for index, (name, number) in sorted(sim.items()):
+        sim_by_name.setdefault(name, (index, number))  # Duplicate names on the SIM are left alone
+
+    contacts = load_contacts(contacts_file)
+    local = {}
+    for name, number in contacts.items():
+        local.setdefault(sim_name(name, name_length), (name, number[:number_length]))
+
+    state = load_sync_state(state_file)
+    known_sim = iccid is not None and state.get("iccid") == iccid
+    synced = state.get("entries", {}) if known_sim else {}
+    if not known_sim:
+        print("Phonebook sync: SIM not synced before, merging without deleting anything.")
+    # A side that has dropped to empty is more likely unreadable than emptied on purpose
+    allow_delete = bool(local) and bool(sim_by_name)
+    if synced and not allow_delete:
+        print("Phonebook sync: one side is empty, restoring it instead of deleting the other.")
+    free = (i for i in range(first, last + 1) if i not in sim)
+    stats = {"to_sim": 0, "to_local": 0, "deleted_sim": 0, "deleted_local": 0, "unchanged": 0}
+    entries = {}
+    local_changed = False
+
+    for name in list(dict.fromkeys(list(local) + list(sim_by_name))):
+        last_hash = synced.get(name, {}).get("hash")
+        in_local, in_sim = name in local, name in sim_by_name
+        local_hash = entry_hash(name, local[name][1]) if in_local else None
+        sim_hash = entry_hash(name, sim_by_name[name][1]) if in_sim else None
+
+        if in_local and in_sim and local_hash == sim_hash:
+            entries[name] = {"index": sim_by_name[name][0], "hash": sim_hash}
+            stats["unchanged"] += 1
+        elif allow_delete and in_local and not in_sim and last_hash == local_hash:
+            del contacts[local[name][0]]
+            local_changed = True
+            stats["deleted_local"] += 1
+        elif allow_delete and in_sim and not in_local and last_hash == sim_hash:
+            delete_entry(at, sim_by_name[name][0])
+            stats["deleted_sim"] += 1
+        elif in_sim and (not in_local or local_hash == last_hash):
+            index, number = sim_by_name[name]
+            if in_local:
+                contacts[local[name][0]] = number
+            else:
+                contacts[name] = number
+            local_changed = True
+            entries[name] = {"index": index, "hash": sim_hash}
+            stats["to_local"] += 1
+        else:
+            index = sim_by_name[name][0] if in_sim else next(free, None)
+            if index is None:
+                print(f"SIM phonebook full; {name} not copied.")
+                continue
+            write_entry(at, index, name, local[name][1])
+            entries[name] = {"index": index, "hash": local_hash}
+            stats["to_sim"] += 1
+
+    if local_changed:
+        write_contacts(contacts, contacts_file)
+    save_sync_state({"iccid": iccid, "entries": entries}, state_file)
+    return stats
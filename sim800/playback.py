@@ -0,0 +1,315 @@
+import threading
+import time
+import wave
+
+import numpy as np
+import pyaudio
+
+# --- Playback Configuration ---
+PLAYBACK_RATE = 16000          # Output sample rate; assets are resampled to it on load
+FRAMES_PER_BUFFER = 256        # 16 ms at 16 kHz; keeps the time to first sample low
+LATENCY_BUDGET = 0.050         # Ring and prompt latency target in seconds
+LOWPASS_TAPS = 127             # Anti-aliasing filter length used when an asset is downsampled
+
+_engine = None                 # Shared engine used by play_file()
+_engine_lock = threading.Lock()
+
+
+def lowpass(samples, cutoff, taps=LOWPASS_TAPS):
+    """
+    Windowed-sinc low-pass filter; cutoff is a fraction of the sample rate (0-0.5).
+    """
+    n = np.arange(taps) - (taps - 1) / 2.0
+    kernel = 2 * cutoff * np.sinc(2 * cutoff * n) * np.blackman(taps)
+    kernel /= kernel.sum()
+    return np.convolve(samples, kernel.astype(np.float32), mode="same")
+
+
+def decode_wav(path, rate=PLAYBACK_RATE):
+    """
+    Decode a WAV file into a mono float32 array at the given sample rate.
+    Supports 8-bit and 16-bit PCM; multi-channel files are downmixed.
+    Files at a higher rate are low-pass filtered before decimating, so
+    content above the new Nyquist frequency does not alias.
+    """
+    with wave.open(path, "rb") as wf:
+        channels = wf.getnchannels()
+        width = wf.getsampwidth()
+        src_rate = wf.getframerate()
+        raw = wf.readframes(wf.getnframes())
+
+    if width == 2:
+        samples = np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768.0
+    elif width == 1:
+        samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    else:
+        raise ValueError(f"Unsupported sample width {width * 8} bits in {path}")
+
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+
+    if src_rate != rate and len(samples):
+        if src_rate > rate:
+            samples = lowpass(samples, 0.45 * rate / src_rate)
+        duration = len(samples) / src_rate
+        target = np.arange(int(duration * rate)) / rate
+        source = np.arange(len(samples)) / src_rate
+        samples = np.interp(target, source, samples).astype(np.float32)
+
+    return samples
+
+
+class Voice:
+    """
+    A single sound playing on the engine. Returned by PlaybackEngine.play()
+    so the caller can stop it, wait for it, or read its latency.
+    """
+
+    def __init__(self, name, samples, loop=False, gain=1.0):
+        self.name = name
+        self.samples = samples
+        self.loop = loop
+        self.gain = gain
+        self.position = 0
+        self.requested_at = time.monotonic()
+        self.first_sample_at = None
+        self.ends_at = None            # When the last sample reaches the DAC, once it is known
+        self.stopped = False
+        self.done = threading.Event()
+
+    @property
+    def latency(self):
+        """
+        Time from play() to the first sample reaching the DAC, in seconds,
+        or None if the voice has not started yet.
+        """
+        if self.first_sample_at is None:
+            return None
+        return self.first_sample_at - self.requested_at
+
+    def stop(self):
+        """
+        Cut the voice off at the next buffer boundary.
+        """
+        self.stopped = True
+
+    def wait(self, timeout=None):
+        """
+        Block until the voice has been heard to the end, or is stopped.
+        The last buffer is still on its way to the DAC when the callback hands
+        it over, so this also waits out the output latency.
+        """
+        if not self.done.wait(timeout):
+            return False
+        if self.ends_at is not None:
+            remaining = self.ends_at - time.monotonic()
+            if remaining > 0:
+                time.sleep(remaining)
+        return True
+
+
+class PlaybackEngine:
+    """
+    Low-latency playback engine for prompts and ringtones.
+    WAV assets are decoded into memory once, the output stream stays open,
+    and any number of voices are mixed in the stream callback.
+    """
+
+    def __init__(self, rate=PLAYBACK_RATE, device_index=None,
+                 frames_per_buffer=FRAMES_PER_BUFFER):
+        self.rate = rate
+        self.device_index = device_index
+        self.frames_per_buffer = frames_per_buffer
+        self.sounds = {}
+        self.voices = []
+        self.lock = threading.Lock()
+        self.pa = None
+        self.stream = None
+        self.output_latency = 0.0
+        self.tail_until = 0.0          # Audio already handed over plays until then
+
+    def start(self):
+        """
+        Open the output stream. It stays open, playing silence, until close().
+        """
+        if self.stream is not None:
+            return
+        self.pa = pyaudio.PyAudio()
+        self.stream = self.pa.open(
+            format=pyaudio.paInt16,
+            channels=1,
+            rate=self.rate,
+            output=True,
+            output_device_index=self.device_index,
+            frames_per_buffer=self.frames_per_buffer,
+            stream_callback=self._callback
+        )
+        self.output_latency = self.stream.get_output_latency()
+        self.stream.start_stream()
+
+    def close(self):
+        """
+        Stop all voices and release the output stream. Audio already handed
+        to PortAudio is played out (stop_stream drains it) before closing.
+        """
+        self.stop_all()
+        if self.stream is not None:
+            self.stream.stop_stream()
+            self.stream.close()
+            self.stream = None
+        with self.lock:
+            for voice in self.voices:
+                voice.done.set()
+            self.voices = []
+        if self.pa is not None:
+            self.pa.terminate()
+            self.pa = None
+
+    def load(self, name, path):
+        """
+        Decode a WAV file into memory under the given name.
+        Loading an already loaded name is a no-op.
+        """
+        if name not in self.sounds:
+            self.sounds[name] = decode_wav(path, self.rate)
+        return self.sounds[name]
+
+    def play(self, name, loop=False, gain=1.0, interrupt=False):
+        """
+        Start playing a loaded sound without blocking and return its Voice.
+        With interrupt=True every other voice is cut off first.
+        """
+        if self.stream is None:
+            self.start()
+        voice = Voice(name, self.sounds[name], loop=loop, gain=gain)
+        with self.lock:
+            if interrupt:
+                for other in self.voices:
+                    other.stop()
+            self.voices.append(voice)
+        return voice
+
+    @property
+    def playing(self):
+        """
+        True while any voice is still playing or its end has not reached the DAC yet.
+        """
+        with self.lock:
+            return time.monotonic() < self.tail_until or any(not voice.done.is_set() for voice in self.voices)
+
+    def stop(self, name):
+        """
+        Stop every voice playing the named sound (e.g. the ringtone once the call is answered).
+        """
+        with self.lock:
+            for voice in self.voices:
+                if voice.name == name:
+                    voice.stop()
+
+    def stop_all(self):
+        """
+        Stop every voice.
+        """
+        with self.lock:
+            for voice in self.voices:
+                voice.stop()
+
+    def _callback(self, in_data, frame_count, time_info, status):
+        """
+        PortAudio callback: mix the active voices into one int16 buffer.
+        """
+        out = np.zeros(frame_count, dtype=np.float32)
+        now = time.monotonic()
+        dac_delay = 0.0
+        if time_info:
+            dac_delay = max(0.0, time_info.get("output_buffer_dac_time", 0.0)
+                            - time_info.get("current_time", 0.0))
+        if not dac_delay:
+            dac_delay = self.output_latency   # Some host APIs leave the timestamps at 0
+
+        with self.lock:
+            active = []
+            for voice in self.voices:
+                if voice.stopped:
+                    voice.done.set()
+                    continue
+                if voice.first_sample_at is None:
+                    voice.first_sample_at = now + dac_delay
+                filled = 0
+                while filled < frame_count:
+                    chunk = voice.samples[voice.position:voice.position + frame_count - filled]
+                    out[filled:filled + len(chunk)] += chunk * voice.gain
+                    filled += len(chunk)
+                    voice.position += len(chunk)
+                    if voice.position >= len(voice.samples):
+                        if not voice.loop or not len(voice.samples):
+                            break
+                        voice.position = 0
+                if voice.position >= len(voice.samples) and not voice.loop:
+                    voice.ends_at = now + dac_delay + filled / self.rate
+                    self.tail_until = max(self.tail_until, voice.ends_at)
+                    voice.done.set()
+                    continue
+                active.append(voice)
+            self.voices = active
+
+        np.clip(out, -1.0, 1.0, out=out)
+        return ((out * 32767.0).astype("<i2").tobytes(), pyaudio.paContinue)
+
+
+def get_engine():
+    """
+    Return the shared playback engine, starting it on first use.
+    """
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = PlaybackEngine()
+            _engine.start()
+        return _engine
+
+
+def shared_engine_playing():
+    """
+    True while the shared engine is playing anything. Does not start the
+    engine, so it can be registered as an echo gate source up front.
+    """
+    engine = _engine
+    return engine is not None and engine.playing
+
+
+def close_engine():
+    """
+    Close the shared engine, letting queued audio finish first. Scripts that
+    play through play_file() call this before exiting.
+    """
+    global _engine
+    with _engine_lock:
+        if _engine is not None:
+            _engine.close()
+            _engine = None
+
+
+def report_latency(voice):
+    """
+    Print the time to first sample for a voice and flag it if over budget.
+    """
+    latency = voice.latency
+    if latency is None:
+        print(f"{voice.name}: not started yet")
+        return
+    flag = "" if latency <= LATENCY_BUDGET else " (over budget)"
+    print(f"{voice.name}: first sample after {latency * 1000:.1f} ms{flag}")
+
+
+def play_file(path, wait=True):
+    """
+    Play a WAV file through the shared engine.
+    The file is decoded only the first time it is played.
+    """
+    engine = get_engine()
+    engine.load(path, path)
+    voice = engine.play(path)
+    if wait:
+        voice.wait()
+    return voice
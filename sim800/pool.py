@@ -0,0 +1,272 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+from sim800.at import connect
+from sim800.call import CallManager
+from sim800.sms import list_messages, send_sms, set_text_mode
+
+# --- Pool Configuration ---
+BAUD_RATE = 9600
+SMS_PER_MINUTE = 10            # Per-SIM limit; most carriers throttle bulk senders
+CALLS_PER_MINUTE = 4
+DEFAULT_CALL_DURATION = 30     # Seconds before a pooled call is hung up
+
+
+class RateLimiter:
+    """
+    Token bucket allowing `per_minute` operations per minute with bursts up to `burst`.
+    """
+
+    def __init__(self, per_minute, burst=None):
+        self.rate = per_minute / 60.0
+        self.capacity = burst if burst is not None else max(1, per_minute)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self):
+        """
+        Seconds until a token is available (0 if one is available now).
+        """
+        self._refill()
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate if self.rate > 0 else float("inf")
+
+    def take(self):
+        self._refill()
+        self.tokens -= 1
+
+
+class Job:
+    """
+    A unit of work for the pool: an SMS, a call or an inbox read.
+    `future` receives the result.
+    """
+
+    def __init__(self, kind, number, text=None, duration=DEFAULT_CALL_DURATION):
+        self.kind = kind
+        self.number = number
+        self.text = text
+        self.duration = duration
+        self.future = Future()
+        self.submitted = time.monotonic()
+        self.modem = None
+
+
+class PooledModem:
+    """
+    One SIM800L in the pool, with its own worker thread and rate limits.
+    """
+
+    def __init__(self, port, baud_rate=BAUD_RATE, sms_per_minute=SMS_PER_MINUTE,
+                 calls_per_minute=CALLS_PER_MINUTE):
+        self.port = port
+        self.baud_rate = baud_rate
+        self.at = None
+        self.calls = None
+        self.state = "offline"          # offline, idle, busy, in_call or error
+        self.limits = {"sms": RateLimiter(sms_per_minute), "call": RateLimiter(calls_per_minute)}
+        self.job = None
+        self.completed = 0
+        self.failed = 0
+        self.wakeup = threading.Event()
+        self.thread = None
+
+    def open(self):
+        """
+        Open the port and check the modem answers AT.
+        """
+        try:
+            self.at = connect(self.port, self.baud_rate)
+            set_text_mode(self.at)
+            self.calls = CallManager(self.at)
+            self.state = "idle"
+        except Exception as e:
+            print(f"[{self.port}] Modem not available: {e}")
+            self.state = "error"
+        return self.state == "idle"
+
+    @property
+    def online(self):
+        return self.state not in ("offline", "error")
+
+    def close(self):
+        if self.at is not None:
+            self.at.close()
+        self.state = "offline"
+
+    def call(self, number, duration):
+        """
+        Dial, keep the call up until it ends or `duration` passes, then hang up.
+        Returns how the call ended.
+        """
+        if not self.calls.dial(number):
+            return self.calls.end_reason
+        self.state = "in_call"
+        if not self.calls.wait_end(duration):
+            self.calls.hang_up("timeout")
+        return self.calls.end_reason
+
+    def run(self, job):
+        self.state = "busy"
+        try:
+            if job.kind == "sms":
+                result = send_sms(self.at, job.number, job.text)
+            elif job.kind == "inbox":
+                result = list_messages(self.at)
+            else:
+                result = self.call(job.number, job.duration)
+            self.completed += 1
+            job.future.set_result(result)
+        except Exception as e:
+            self.failed += 1
+            job.future.set_exception(e)
+        finally:
+            self.state = "idle"
+
+
+class ModemPool:
+    """
+    Schedule SMS and call jobs across several SIM800L modems.
+    A dispatcher hands each queued job to the first idle modem whose
+    per-SIM rate limit allows it, skipping over jobs that have to wait for
+    their limit; each modem runs its jobs on its own thread. With no modem
+    online, jobs fail at once instead of waiting forever.
+    """
+
+    def __init__(self, ports, baud_rate=BAUD_RATE, sms_per_minute=SMS_PER_MINUTE,
+                 calls_per_minute=CALLS_PER_MINUTE):
+        self.modems = [PooledModem(p, baud_rate, sms_per_minute, calls_per_minute) for p in ports]
+        self.pending = deque()
+        self.cond = threading.Condition()
+        self.running = False
+        self.dispatcher = None
+
+    def start(self):
+        """
+        Open every modem and start the worker and dispatcher threads.
+        Returns the number of modems that came up.
+        """
+        self.running = True
+        for modem in self.modems:
+            if modem.open():
+                modem.thread = threading.Thread(target=self._worker, args=(modem,), daemon=True)
+                modem.thread.start()
+        self.dispatcher = threading.Thread(target=self._dispatch, daemon=True)
+        self.dispatcher.start()
+        return sum(m.state == "idle" for m in self.modems)
+
+    def stop(self):
+        """
+        Stop scheduling, fail the jobs still queued and close the ports.
+        """
+        with self.cond:
+            self.running = False
+            self._fail_pending("Modem pool stopped")
+            self.cond.notify_all()
+        for modem in self.modems:
+            modem.wakeup.set()
+            if modem.thread is not None:
+                modem.thread.join(timeout=5)
+            modem.close()
+
+    def submit(self, job):
+        with self.cond:
+            self.pending.append(job)
+            self.cond.notify_all()
+        return job.future
+
+    def send_sms(self, number, text):
+        """
+        Queue an SMS; returns a Future resolving to the message reference.
+        """
+        return self.submit(Job("sms", number, text=text))
+
+    def call(self, number, duration=DEFAULT_CALL_DURATION):
+        """
+        Queue a call; returns a Future resolving to how the call ended.
+        """
+        return self.submit(Job("call", number, duration=duration))
+
+    def inbox(self):
+        """
+        Queue a read of the SIM inbox; returns a Future resolving to the messages.
+        """
+        return self.submit(Job("inbox", None))
+
+    def hang_up(self, port=None):
+        """
+        End the pooled calls in progress (only the one on `port` if given).
+        Returns the number of calls asked to hang up.
+        """
+        count = 0
+        for modem in self.modems:
+            if modem.state == "in_call" and port in (None, modem.port):
+                modem.calls.hang_up()
+                count += 1
+        return count
+
+    def status(self):
+        """
+        Snapshot of every modem's state and counters.
+        """
+        return [{"port": m.port, "state": m.state, "completed": m.completed, "failed": m.failed}
+                for m in self.modems]
+
+    def _fail_pending(self, reason):
+        while self.pending:
+            self.pending.popleft().future.set_exception(RuntimeError(reason))
+
+    def _dispatch(self):
+        with self.cond:
+            while self.running:
+                if not any(m.online for m in self.modems):
+                    self._fail_pending("No modem online")
+                wait = None
+                for job in list(self.pending):
+                    modem, delay = self._pick(job.kind)
+                    if modem is None:
+                        if delay is not None:
+                            wait = delay if wait is None else min(wait, delay)
+                        continue
+                    self.pending.remove(job)
+                    if job.kind in modem.limits:
+                        modem.limits[job.kind].take()
+                    modem.job = job
+                    modem.state = "busy"
+                    modem.wakeup.set()
+                self.cond.wait(timeout=wait)
+
+    def _pick(self, kind):
+        """
+        Return (modem, 0) for a free modem allowed to run this kind of job,
+        or (None, seconds to wait) when none is.
+        """
+        delay = None
+        for modem in self.modems:
+            if modem.state != "idle" or modem.job is not None:
+                continue
+            wait = modem.limits[kind].wait_time() if kind in modem.limits else 0
+            if wait == 0:
+                return modem, 0
+            delay = wait if delay is None else min(delay, wait)
+        return None, delay
+
+    def _worker(self, modem):
+        while self.running:
+            modem.wakeup.wait()
+            modem.wakeup.clear()
+            job, modem.job = modem.job, None
+            if job is None:
+                continue
+            job.modem = modem.port
+            modem.run(job)
+            with self.cond:
+                self.cond.notify_all()
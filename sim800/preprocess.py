@@ -0,0 +1,151 @@
+import time
+
+import numpy as np
+
+# --- Preprocessing Configuration ---
+SAMPLE_RATE = 16000
+FRAME_SIZE = 512               # STFT frame (32 ms); frames overlap by half
+HOP_SIZE = FRAME_SIZE // 2
+DC_ALPHA = 0.95                # Per-block smoothing of the DC offset estimate
+NOISE_HISTORY = 6              # Blocks (1.5 s) whose quietest mean power per bin is taken as noise
+NOISE_BIAS = 1.5               # That minimum underestimates the mean noise power by about this much
+OVER_SUBTRACTION = 2.0         # Noise power subtracted, as a multiple of the estimate
+GAIN_FLOOR = 0.1               # Lowest spectral gain (-20 dB), keeps some background and avoids musical noise
+AGC_TARGET_RMS = 3000.0        # About -21 dBFS
+AGC_MAX_GAIN = 8.0
+AGC_MIN_GAIN = 0.25
+AGC_GATE_RMS = 150.0           # Blocks quieter than this are treated as silence and not boosted
+AGC_ATTACK = 0.5               # Fraction of the way to the new gain per block when turning down
+AGC_RELEASE = 0.1              # ... and when turning up
+CPU_BUDGET = 0.15              # Max processing time as a fraction of the block's audio duration
+OVER_BUDGET_BLOCKS = 8         # Consecutive blocks over budget before noise suppression is dropped
+
+
+class AudioPreprocessor:
+    """
+    Clean up int16 mic blocks before they reach the recognizer: DC removal,
+    spectral noise suppression and automatic gain control, all vectorized
+    with NumPy. process() takes and returns bytes of the same length; the
+    output lags the input by one STFT frame (32 ms).
+
+    If noise suppression keeps taking more than CPU_BUDGET of each block's
+    duration, it is switched off and only the cheap stages keep running.
+    """
+
+    def __init__(self, sample_rate=SAMPLE_RATE, noise_suppression=True, agc=True, dc_removal=True,
+                 budget=CPU_BUDGET):
+        self.sample_rate = sample_rate
+        self.noise_suppression = noise_suppression
+        self.agc = agc
+        self.dc_removal = dc_removal
+        self.budget = budget
+        # sqrt-Hann analysis and synthesis windows sum to one at 50% overlap
+        self.window = np.sqrt(np.hanning(FRAME_SIZE + 1)[:FRAME_SIZE]).astype(np.float32)
+        self.blocks = 0
+        self.audio_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.max_block_seconds = 0.0
+        self.over_budget = 0
+        self.reset()
+
+    def reset(self):
+        """
+        Forget the adaptive state (not the timing), e.g. between unrelated recordings.
+        """
+        self.dc = 0.0
+        self.history = None
+        self.gain = 1.0
+        self.inbuf = np.zeros(FRAME_SIZE - HOP_SIZE, dtype=np.float32)
+        self.outbuf = np.zeros(HOP_SIZE, dtype=np.float32)
+        self.tail = np.zeros(HOP_SIZE, dtype=np.float32)
+
+    @property
+    def real_time_factor(self):
+        """
+        Processing time divided by audio time, over every block so far.
+        """
+        return self.cpu_seconds / self.audio_seconds if self.audio_seconds else 0.0
+
+    def process(self, data):
+        start = time.perf_counter()
+        x = np.frombuffer(data, dtype="<i2").astype(np.float32)
+        if self.dc_removal:
+            x = self._remove_dc(x)
+        if self.noise_suppression:
+            x = self._suppress_noise(x)
+        if self.agc:
+            x = self._apply_agc(x)
+        out = np.clip(x, -32768, 32767).astype("<i2").tobytes()
+        self._account(len(x), time.perf_counter() - start)
+        return out
+
+    # --- Stages ---
+
+    def _remove_dc(self, x):
+        if len(x):
+            self.dc = DC_ALPHA * self.dc + (1 - DC_ALPHA) * float(x.mean())
+        return x - self.dc
+
+    def _suppress_noise(self, x):
+        """
+        Streaming spectral subtraction with 50% overlap-add. The noise
+        estimate per frequency bin is the quietest block mean power over the
+        last 1.5 s (minimum statistics), so pauses between words set it and
+        speech does not pull it up.
+        """
+        buf = np.concatenate((self.inbuf, x))
+        count = (len(buf) - FRAME_SIZE) // HOP_SIZE + 1
+        if count > 0:
+            frames = np.lib.stride_tricks.sliding_window_view(buf, FRAME_SIZE)[::HOP_SIZE][:count]
+            spectrum = np.fft.rfft(frames * self.window, axis=1)
+            power = spectrum.real ** 2 + spectrum.imag ** 2
+            mean_power = power.mean(axis=0)
+            if self.history is None:
+                self.history = np.tile(mean_power, (NOISE_HISTORY, 1))
+            else:
+                self.history = np.vstack((self.history[1:], mean_power[None, :]))
+            noise = self.history.min(axis=0) * NOISE_BIAS
+            gain = np.maximum(1.0 - OVER_SUBTRACTION * noise / np.maximum(power, 1e-9), GAIN_FLOOR)
+            frames_out = np.fft.irfft(spectrum * gain, n=FRAME_SIZE, axis=1).astype(np.float32) * self.window
+            previous = np.vstack((self.tail[None, :], frames_out[:-1, HOP_SIZE:]))
+            produced = (frames_out[:, :HOP_SIZE] + previous).reshape(-1)
+            self.tail = frames_out[-1, HOP_SIZE:].copy()
+            self.inbuf = buf[count * HOP_SIZE:]
+            self.outbuf = np.concatenate((self.outbuf, produced))
+        else:
+            self.inbuf = buf
+        out, self.outbuf = self.outbuf[:len(x)], self.outbuf[len(x):]
+        return out
+
+    def _apply_agc(self, x):
+        """
+        Move the gain towards AGC_TARGET_RMS once per block and ramp it
+        across the block so the change does not click.
+        """
+        if not len(x):
+            return x
+        rms = float(np.sqrt(np.mean(x * x)))
+        target = self.gain
+        if rms > AGC_GATE_RMS:
+            target = min(max(AGC_TARGET_RMS / rms, AGC_MIN_GAIN), AGC_MAX_GAIN)
+        rate = AGC_ATTACK if target < self.gain else AGC_RELEASE
+        new_gain = self.gain + rate * (target - self.gain)
+        ramp = np.linspace(self.gain, new_gain, len(x), dtype=np.float32)
+        self.gain = new_gain
+        return x * ramp
+
+    # --- CPU budget ---
+
+    def _account(self, samples, elapsed):
+        duration = samples / self.sample_rate
+        self.blocks += 1
+        self.audio_seconds += duration
+        self.cpu_seconds += elapsed
+        self.max_block_seconds = max(self.max_block_seconds, elapsed)
+        if not self.noise_suppression or not duration:
+            return
+        self.over_budget = self.over_budget + 1 if elapsed > self.budget * duration else 0
+        if self.over_budget >= OVER_BUDGET_BLOCKS:
+            self.noise_suppression = False
+            print(f"Audio preprocessing over its CPU budget ({elapsed * 1000:.1f} ms for "
+                  f"{duration * 1000:.0f} ms of audio); noise suppression disabled.")
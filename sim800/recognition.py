@@ -0,0 +1,218 @@
+"""
+One Vosk model shared by every recognizer in the process.
+
+shared_model() loads a model once per path. RecognitionService keeps a pool
+of KaldiRecognizers on it, reset and reused instead of rebuilt, and runs one
+worker thread per input stream (a mic, the far end of a call, a recording).
+Vosk releases the GIL while decoding, so streams decode in parallel on
+separate cores while the model is in memory only once.
+"""
+import json
+import subprocess
+import threading
+import wave
+
+# --- Recognition Service ---
+SAMPLE_RATE = 16000
+BLOCK_FRAMES = 4000            # Same block size as the voice loop
+
+_models = {}
+_models_lock = threading.Lock()
+
+
+def shared_model(path):
+    """
+    Load the Vosk model at path, or return the one already loaded.
+    """
+    with _models_lock:
+        if path not in _models:
+            from vosk import Model
+            _models[path] = Model(path)
+        return _models[path]
+
+
+class RecognizerPool:
+    """
+    Recognizers on one model, kept per configuration (word timings, grammar)
+    and reset on release so the next stream starts clean.
+    """
+
+    def __init__(self, model, sample_rate=SAMPLE_RATE):
+        self.model = model
+        self.sample_rate = sample_rate
+        self.free = {}
+        self.keys = {}
+        self.lock = threading.Lock()
+        self.created = 0
+
+    def acquire(self, words=True, grammar=None):
+        key = (words, json.dumps(grammar) if grammar is not None else None)
+        with self.lock:
+            idle = self.free.get(key)
+            if idle:
+                return idle.pop()
+            self.created += 1
+        from vosk import KaldiRecognizer
+        if grammar is not None:
+            recognizer = KaldiRecognizer(self.model, self.sample_rate, key[1])
+        else:
+            recognizer = KaldiRecognizer(self.model, self.sample_rate)
+        recognizer.SetWords(words)
+        with self.lock:
+            self.keys[id(recognizer)] = key
+        return recognizer
+
+    def release(self, recognizer):
+        recognizer.Reset()
+        with self.lock:
+            self.free.setdefault(self.keys[id(recognizer)], []).append(recognizer)
+
+
+class Stream:
+    """
+    One input stream being recognized on its own worker thread.
+    """
+
+    def __init__(self, name, read_block, on_result, recognizer, on_end=None):
+        self.name = name
+        self.read_block = read_block
+        self.on_result = on_result
+        self.on_end = on_end
+        self.recognizer = recognizer
+        self.running = False
+        self.thread = None
+        self.audio_seconds = 0.0
+
+    def _run(self, service):
+        try:
+            while self.running:
+                data = self.read_block()
+                if not data:
+                    break
+                self.audio_seconds += len(data) / 2 / service.pool.sample_rate
+                if self.recognizer.AcceptWaveform(data):
+                    self._deliver(json.loads(self.recognizer.Result()))
+            self._deliver(json.loads(self.recognizer.FinalResult()))
+        except Exception as e:
+            print(f"Recognition error on {self.name}:", e)
+        finally:
+            service._finished(self)
+
+    def _deliver(self, result):
+        if result.get("text"):
+            try:
+                self.on_result(self.name, result)
+            except Exception as e:
+                print(f"Error handling result on {self.name}:", e)
+
+
+class RecognitionService:
+    """
+    Recognize any number of audio streams against one shared model.
+
+        service = RecognitionService(MODEL_PATH)
+        service.add_stream("far end", ParecSource(tap).read, on_result)
+        ...
+        service.remove_stream("far end")
+
+    read_block() returns int16 mono bytes at the service's sample rate and
+    an empty value at the end of the stream. on_result(name, result) is
+    called on the stream's worker thread for every final result.
+    """
+
+    def __init__(self, model_path=None, model=None, sample_rate=SAMPLE_RATE):
+        self.pool = RecognizerPool(model if model is not None else shared_model(model_path), sample_rate)
+        self.streams = {}
+        self.lock = threading.Lock()
+
+    def add_stream(self, name, read_block, on_result, words=True, grammar=None, on_end=None):
+        """
+        Start recognizing a stream on its own worker thread. on_end(name), if
+        given, is called once the stream has ended and its recognizer is back in the pool.
+        """
+        with self.lock:
+            if name in self.streams:
+                raise ValueError(f"Stream {name!r} already exists")
+            stream = Stream(name, read_block, on_result, self.pool.acquire(words, grammar), on_end)
+            self.streams[name] = stream
+        stream.running = True
+        stream.thread = threading.Thread(target=stream._run, args=(self,), name=f"recognize-{name}", daemon=True)
+        stream.thread.start()
+        return stream
+
+    def remove_stream(self, name, timeout=2.0):
+        """
+        Stop a stream after its current block and wait for its worker.
+        """
+        with self.lock:
+            stream = self.streams.get(name)
+        if stream is None:
+            return
+        stream.running = False
+        stream.thread.join(timeout)
+
+    def wait(self, name, timeout=None):
+        """
+        Wait for a stream to reach its end on its own.
+        """
+        with self.lock:
+            stream = self.streams.get(name)
+        if stream is not None:
+            stream.thread.join(timeout)
+
+    def close(self):
+        for name in list(self.streams):
+            self.remove_stream(name)
+
+    def _finished(self, stream):
+        with self.lock:
+            if self.streams.get(stream.name) is stream:
+                del self.streams[stream.name]
+        self.pool.release(stream.recognizer)
+        if stream.on_end is not None:
+            try:
+                stream.on_end(stream.name)
+            except Exception as e:
+                print(f"Error ending stream {stream.name}:", e)
+
+
+# --- Sources ---
+
+class ParecSource:
+    """
+    Read a PulseAudio source or sink monitor with parec, e.g. the far end of a call.
+    """
+
+    def __init__(self, device, rate=SAMPLE_RATE, block_frames=BLOCK_FRAMES):
+        self.block_bytes = block_frames * 2
+        self.proc = subprocess.Popen(["parec", f"--device={device}", "--format=s16le", f"--rate={rate}",
+                                      "--channels=1", "--raw"], stdout=subprocess.PIPE)
+
+    def read(self):
+        return self.proc.stdout.read(self.block_bytes)
+
+    def close(self):
+        self.proc.terminate()
+        try:
+            self.proc.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+
+
+class WavSource:
+    """
+    Read a 16 kHz mono 16-bit WAV file block by block, e.g. a voicemail recording.
+    """
+
+    def __init__(self, path, block_frames=BLOCK_FRAMES):
+        self.wf = wave.open(path, "rb")
+        if self.wf.getnchannels() != 1 or self.wf.getsampwidth() != 2 or self.wf.getframerate() != SAMPLE_RATE:
+            self.wf.close()
+            raise ValueError(f"{path}: expected 16 kHz mono 16-bit PCM")
+        self.block_frames = block_frames
+
+    def read(self):
+        data = self.wf.readframes(self.block_frames)
+        if not data:
+            self.wf.close()
+        return data
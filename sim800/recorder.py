@@ -0,0 +1,219 @@
+import os
+import shutil
+import subprocess
+import threading
+import time
+import wave
+
+import numpy as np
+
+from sim800.audio_routing import CALL_TAPS
+
+# --- Recording Configuration ---
+RECORDING_DIR = "recordings"
+RECORD_RATE = 16000
+BLOCK_FRAMES = 1600            # 100 ms per read; the only audio held in memory
+CHUNK_SECONDS = 60             # Length of each file on disk
+MAX_RECORDING_BYTES = 500 * 1024 * 1024
+MAX_RECORDING_AGE = 14 * 24 * 3600
+MIN_FREE_BYTES = 200 * 1024 * 1024
+
+ENCODER_EXTENSIONS = {"wav": ".wav", "flac": ".flac", "opus": ".opus"}
+
+
+def encoder_command(codec, path, channels, rate=RECORD_RATE):
+    """
+    Build the command line of an external encoder reading raw s16le from stdin.
+    """
+    if codec == "flac":
+        return ["flac", "--silent", "--force-raw-format", "--endian=little",
+                "--sign=signed", f"--channels={channels}", "--bps=16",
+                f"--sample-rate={rate}", "-o", path, "-"]
+    if codec == "opus":
+        return ["opusenc", "--quiet", "--raw", f"--raw-rate={rate}",
+                f"--raw-chan={channels}", "-", path]
+    raise ValueError(f"Unknown codec: {codec}")
+
+
+class ChunkWriter:
+    """
+    Write one fixed-length segment, either as a WAV file or through an encoder process.
+    """
+
+    def __init__(self, path, codec, channels, rate=RECORD_RATE):
+        self.path = path
+        self.frames = 0
+        self.wav = None
+        self.proc = None
+        if codec == "wav":
+            self.wav = wave.open(path, "wb")
+            self.wav.setnchannels(channels)
+            self.wav.setsampwidth(2)
+            self.wav.setframerate(rate)
+        else:
+            self.proc = subprocess.Popen(encoder_command(codec, path, channels, rate),
+                                         stdin=subprocess.PIPE)
+
+    def write(self, data, frames):
+        if self.wav is not None:
+            self.wav.writeframes(data)
+        else:
+            self.proc.stdin.write(data)
+        self.frames += frames
+
+    def close(self):
+        if self.wav is not None:
+            self.wav.close()
+        else:
+            self.proc.stdin.close()
+            self.proc.wait()
+
+
+def evict_recordings(directory=RECORDING_DIR, max_bytes=MAX_RECORDING_BYTES,
+                     max_age=MAX_RECORDING_AGE, min_free=MIN_FREE_BYTES):
+    """
+    Delete recordings older than max_age, then the oldest ones until the
+    directory is under max_bytes and the filesystem has min_free bytes left.
+    Returns the list of deleted paths.
+    """
+    if not os.path.isdir(directory):
+        return []
+    extensions = tuple(ENCODER_EXTENSIONS.values())
+    files = []
+    for name in os.listdir(directory):
+        if name.endswith(extensions):
+            path = os.path.join(directory, name)
+            st = os.stat(path)
+            files.append((st.st_mtime, st.st_size, path))
+    files.sort()
+
+    now = time.time()
+    total = sum(size for _, size, _ in files)
+    free = shutil.disk_usage(directory).free
+    deleted = []
+    for mtime, size, path in files:
+        if now - mtime <= max_age and total <= max_bytes and free >= min_free:
+            break
+        try:
+            os.remove(path)
+        except OSError as e:
+            print("Error deleting recording:", e)
+            continue
+        total -= size
+        free += size
+        deleted.append(path)
+    return deleted
+
+
+class CallRecorder:
+    """
+    Record both directions of a call from the PulseAudio loopback sinks.
+    Audio is read in fixed blocks and streamed to disk in fixed-length
+    chunks, so memory use does not grow with the length of the call.
+    """
+
+    def __init__(self, label, taps=CALL_TAPS, directory=RECORDING_DIR, stereo=False,
+                 codec="wav", chunk_seconds=CHUNK_SECONDS, rate=RECORD_RATE):
+        if codec not in ENCODER_EXTENSIONS:
+            raise ValueError(f"Unknown codec: {codec}")
+        self.label = "".join(c for c in label if c.isalnum() or c in "+-_") or "call"
+        self.taps = taps
+        self.directory = directory
+        self.stereo = stereo
+        self.codec = codec
+        self.chunk_frames = int(chunk_seconds * rate)
+        self.rate = rate
+        self.procs = []
+        self.thread = None
+        self.running = False
+        self.writer = None
+        self.part = 0
+        self.started = time.strftime("%Y%m%d_%H%M%S")
+        self.paths = []
+
+    def start(self):
+        """
+        Start one parec process per tap and the thread that mixes and writes them.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        evict_recordings(self.directory)
+        for tap in self.taps:
+            cmd = ["parec", f"--device={tap}", "--format=s16le",
+                   f"--rate={self.rate}", "--channels=1", "--raw"]
+            self.procs.append(subprocess.Popen(cmd, stdout=subprocess.PIPE))
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        print(f"Recording call to {self.directory}/ ({self.codec}, "
+              f"{'stereo' if self.stereo else 'mixed'})")
+
+    def stop(self):
+        """
+        Stop capturing, finish the current chunk and apply retention.
+        """
+        self.running = False
+        for proc in self.procs:
+            proc.terminate()
+        if self.thread is not None:
+            self.thread.join(timeout=2)
+        for proc in self.procs:
+            try:
+                proc.wait(timeout=1)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+        self.procs = []
+        self._close_chunk()
+        evict_recordings(self.directory)
+        print(f"Recording stopped ({len(self.paths)} file(s)).")
+
+    def _open_chunk(self):
+        self.part += 1
+        name = f"call_{self.started}_{self.label}_part{self.part:03d}{ENCODER_EXTENSIONS[self.codec]}"
+        path = os.path.join(self.directory, name)
+        channels = 2 if self.stereo else 1
+        self.writer = ChunkWriter(path, self.codec, channels, self.rate)
+        self.paths.append(path)
+
+    def _close_chunk(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+    def _combine(self, blocks):
+        """
+        Mix the directions into one channel, or interleave them as stereo.
+        """
+        arrays = [np.frombuffer(b, dtype="<i2") for b in blocks]
+        frames = min(len(a) for a in arrays)
+        arrays = [a[:frames] for a in arrays]
+        if self.stereo:
+            while len(arrays) < 2:
+                arrays.append(arrays[0])
+            data = np.column_stack(arrays[:2]).astype("<i2")
+        else:
+            mixed = np.sum([a.astype(np.int32) for a in arrays], axis=0) // len(arrays)
+            data = mixed.astype("<i2")
+        return data.tobytes(), frames
+
+    def _run(self):
+        block_bytes = BLOCK_FRAMES * 2
+        try:
+            while self.running:
+                blocks = []
+                for proc in self.procs:
+                    block = proc.stdout.read(block_bytes)
+                    if not block:
+                        self.running = False
+                        break
+                    blocks.append(block)
+                if len(blocks) != len(self.procs) or not blocks:
+                    break
+                data, frames = self._combine(blocks)
+                if self.writer is None:
+                    self._open_chunk()
+                self.writer.write(data, frames)
+                if self.writer.frames >= self.chunk_frames:
+                    self._close_chunk()
+                    evict_recordings(self.directory)
+        except Exception as e:
+            print("Call recording error:", e)
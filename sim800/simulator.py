@@ -0,0 +1,344 @@
+"""
+A SIM800L simulator on a pseudo-terminal.
+
+The simulator answers the AT commands the scripts in this repo use, with
+configurable delays, so the call, SMS and pool code can be exercised without
+hardware. Clients open SimulatedModem.port with pyserial like a real UART.
+"""
+import os
+import re
+import select
+import termios
+import threading
+import time
+import tty
+
+# termios speed constants back to baud rates, for reading the client's port speed
+TERMIOS_SPEEDS = {getattr(termios, f"B{rate}"): rate
+                  for rate in (1200, 2400, 4800, 9600, 19200, 38400, 57600, 115200, 230400, 460800)
+                  if hasattr(termios, f"B{rate}")}
+
+
+class SimulatedModem:
+    """
+    Emulate one SIM800L on a pty. Start it with start(), point serial.Serial
+    at .port, and stop it with stop().
+    """
+
+    def __init__(self, name="sim", sms_delay=0.5, dial_delay=0.1, call_duration=None,
+                 echo=True, baud_rate=None, answer_delay=0.0):
+        self.name = name
+        self.sms_delay = sms_delay            # Seconds before +CMGS is returned
+        self.dial_delay = dial_delay          # Seconds before OK is returned for ATD
+        self.answer_delay = answer_delay      # Callee answers this long after ATD's OK (None: only remote_answer())
+        self.call_duration = call_duration    # Remote hangs up after this many seconds (None: never)
+        self.echo = echo
+        # None: no line-speed emulation. Otherwise the modem's AT+IPR rate (0 = autobaud):
+        # commands sent at another speed get garbage back, and output is paced at the rate.
+        self.baud_rate = baud_rate
+        self.saved_baud_rate = baud_rate
+        self.master = None
+        self.slave = None
+        self.port = None
+        self.running = False
+        self.thread = None
+        self.buffer = b""
+        self.sms_text_mode = False
+        self.pending_sms = None               # Recipient while collecting SMS text
+        self.sent_sms = []                    # (number, text) of every message sent
+        self.inbox = []                       # (status, number, timestamp, text) for AT+CMGL
+        self.dialed = []                      # Every number dialed
+        self.phonebook = {}                   # SIM phonebook: index -> (number, type, name)
+        self.phonebook_size = 250
+        self.iccid = "89995012345678901234"   # AT+CCID; change it to simulate a swapped SIM
+        self.call_state = None                # None, "dialing", "active" or "incoming"
+        self.call_number = None
+        self.call_timer = None
+        self.call_reports = False             # AT+CLCC=1: report call status changes as +CLCC
+        self.final_on_hang_up = True          # Emit NO CARRIER when the far end hangs up
+        self.message_ref = 0
+        self.lock = threading.Lock()
+
+    def start(self):
+        """
+        Open the pty pair and start answering commands.
+        """
+        self.master, self.slave = os.openpty()
+        tty.setraw(self.slave)
+        self.port = os.ttyname(self.slave)
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stop the simulator and close the pty.
+        """
+        self.running = False
+        if self.call_timer is not None:
+            self.call_timer.cancel()
+        if self.thread is not None:
+            self.thread.join(timeout=1)
+        for fd in (self.master, self.slave):
+            if fd is not None:
+                os.close(fd)
+        self.master = self.slave = None
+
+    # --- Events the test drives from outside ---
+
+    def ring(self, number="+995555000000"):
+        """
+        Simulate an incoming call: emit RING and +CLIP.
+        """
+        with self.lock:
+            self.call_state = "incoming"
+            self.call_number = number
+        self.emit("RING", f'+CLIP: "{number}",145,"",0,"",0')
+
+    def remote_answer(self):
+        """
+        Simulate the callee picking up an outgoing call that is ringing.
+        """
+        with self.lock:
+            if self.call_state != "dialing":
+                return
+            self.call_state = "active"
+        if self.call_reports:
+            self.emit(f'+CLCC: 1,0,0,0,0,"{self.call_number}",145,""')
+        if self.call_duration is not None:
+            self.call_timer = threading.Timer(self.call_duration, self.remote_hang_up)
+            self.call_timer.daemon = True
+            self.call_timer.start()
+
+    def remote_reject(self, result="BUSY"):
+        """
+        Simulate an outgoing call that ends unanswered (BUSY, NO ANSWER).
+        """
+        with self.lock:
+            if self.call_state != "dialing":
+                return
+            self.call_state = None
+        lines = [f'+CLCC: 1,0,6,0,0,"{self.call_number}",145,""'] if self.call_reports else []
+        self.emit(*lines, result)
+
+    def remote_hang_up(self):
+        """
+        Simulate the far end hanging up.
+        """
+        with self.lock:
+            if self.call_state is None:
+                return
+            self.call_state = None
+        lines = [f'+CLCC: 1,0,6,0,0,"{self.call_number}",145,""'] if self.call_reports else []
+        if self.final_on_hang_up:
+            lines.append("NO CARRIER")
+        self.emit(*lines)
+
+    def receive_sms(self, number, text, timestamp="24/01/01,12:00:00+16"):
+        """
+        Store an incoming message and emit +CMTI.
+        """
+        with self.lock:
+            self.inbox.append(("REC UNREAD", number, timestamp, text))
+            index = len(self.inbox)
+        self.emit(f'+CMTI: "SM",{index}')
+
+    def emit(self, *lines):
+        """
+        Write lines to the client, each framed like the modem does.
+        """
+        self._write("".join(f"\r\n{line}\r\n" for line in lines).encode())
+
+    def _write(self, data):
+        """
+        Write raw bytes to the client, paced like a UART at the current rate.
+        """
+        if self.master is None:
+            return
+        if self.baud_rate:
+            time.sleep(len(data) * 10 / self.baud_rate)
+        os.write(self.master, data)
+
+    def _client_baud(self):
+        """
+        The speed the client configured on its end of the pty.
+        """
+        return TERMIOS_SPEEDS.get(termios.tcgetattr(self.slave)[5])
+
+    def _speed_matches(self, line):
+        """
+        Emulate the UART: lock on in autobaud mode, reject a mismatched speed.
+        """
+        if self.baud_rate is None:
+            return True
+        client = self._client_baud()
+        if self.baud_rate == 0 and line.upper().startswith("AT"):
+            self.baud_rate = client
+        return client == self.baud_rate
+
+    # --- Command handling ---
+
+    def _run(self):
+        while self.running:
+            try:
+                ready, _, _ = select.select([self.master], [], [], 0.05)
+            except (OSError, ValueError):
+                break
+            if not ready:
+                continue
+            try:
+                data = os.read(self.master, 1024)
+            except OSError:
+                break
+            self.buffer += data
+            self._process()
+
+    def _process(self):
+        while True:
+            if self.pending_sms is not None:
+                end = self.buffer.find(b"\x1a")
+                if end < 0:
+                    return
+                text = self.buffer[:end].decode(errors="ignore").rstrip("\r\n")
+                self.buffer = self.buffer[end + 1:]
+                number, self.pending_sms = self.pending_sms, None
+                time.sleep(self.sms_delay)
+                self.message_ref += 1
+                self.sent_sms.append((number, text))
+                self.emit(f"+CMGS: {self.message_ref}", "OK")
+                continue
+            end = self.buffer.find(b"\r")
+            if end < 0:
+                return
+            line = self.buffer[:end].decode(errors="ignore").strip()
+            self.buffer = self.buffer[end + 1:].lstrip(b"\n")
+            if not line:
+                continue
+            if not self._speed_matches(line):
+                self._write(bytes([0xfe, 0x7f, 0xe0, 0x0d, 0x0a]))
+                continue
+            if self.echo:
+                self._write((line + "\r\n").encode())
+            self._command(line)
+
+    def _command(self, line):
+        cmd = line.upper()
+        if cmd == "AT":
+            self.emit("OK")
+        elif cmd in ("ATE0", "ATE1"):
+            self.echo = cmd == "ATE1"
+            self.emit("OK")
+        elif cmd == "AT+CPIN?":
+            self.emit("+CPIN: READY", "OK")
+        elif cmd == "AT+CMGF=1":
+            self.sms_text_mode = True
+            self.emit("OK")
+        elif cmd.startswith("AT+CMGS="):
+            match = re.match(r'AT\+CMGS="([^"]+)"', line, re.IGNORECASE)
+            if not self.sms_text_mode or not match:
+                self.emit("ERROR")
+                return
+            self.pending_sms = match.group(1)
+            self._write(b"\r\n> ")
+        elif cmd.startswith("AT+CMGL"):
+            lines = []
+            for i, (status, number, timestamp, text) in enumerate(self.inbox, 1):
+                lines.append(f'+CMGL: {i},"{status}","{number}","","{timestamp}"')
+                lines.append(text)
+            self.emit(*lines, "OK")
+        elif cmd.startswith("ATD"):
+            number = line[3:].rstrip(";")
+            self.dialed.append(number)
+            time.sleep(self.dial_delay)
+            with self.lock:
+                self.call_state = "dialing"
+                self.call_number = number
+            self.emit("OK")
+            if self.call_reports:
+                self.emit(f'+CLCC: 1,0,2,0,0,"{number}",145,""', f'+CLCC: 1,0,3,0,0,"{number}",145,""')
+            if self.answer_delay is not None:
+                self.call_timer = threading.Timer(self.answer_delay, self.remote_answer)
+                self.call_timer.daemon = True
+                self.call_timer.start()
+        elif cmd == "ATA":
+            with self.lock:
+                ok = self.call_state == "incoming"
+                if ok:
+                    self.call_state = "active"
+            self.emit("OK" if ok else "NO CARRIER")
+        elif cmd == "ATH":
+            with self.lock:
+                self.call_state = None
+            if self.call_timer is not None:
+                self.call_timer.cancel()
+            self.emit("OK")
+        elif cmd in ("AT+CLCC=0", "AT+CLCC=1"):
+            self.call_reports = cmd.endswith("1")
+            self.emit("OK")
+        elif cmd == "AT+CLCC":
+            with self.lock:
+                state, number = self.call_state, self.call_number
+            if state is None:
+                self.emit("OK")
+            else:
+                stat = {"dialing": 3, "active": 0, "incoming": 4}[state]
+                self.emit(f'+CLCC: 1,0,{stat},0,0,"{number}",145,""', "OK")
+        elif cmd.startswith("AT+VTS="):
+            self.emit("OK")
+        elif cmd == "AT+IPR?":
+            self.emit(f"+IPR: {self.baud_rate or 0}", "OK")
+        elif cmd.startswith("AT+IPR="):
+            try:
+                rate = int(cmd.split("=", 1)[1])
+            except ValueError:
+                self.emit("ERROR")
+                return
+            if rate and rate not in TERMIOS_SPEEDS.values():
+                self.emit("ERROR")
+                return
+            self.emit("OK")
+            if self.baud_rate is not None:
+                self.baud_rate = rate
+        elif cmd.startswith("AT+CPBS="):
+            self.emit("OK")
+        elif cmd == "AT+CPBS?":
+            self.emit(f'+CPBS: "SM",{len(self.phonebook)},{self.phonebook_size}', "OK")
+        elif cmd == "AT+CPBR=?":
+            self.emit(f"+CPBR: (1-{self.phonebook_size}),40,14", "OK")
+        elif cmd.startswith("AT+CPBR="):
+            bounds = cmd.split("=", 1)[1].split(",")
+            first, last = int(bounds[0]), int(bounds[-1])
+            lines = [f'+CPBR: {i},"{number}",{kind},"{name}"'
+                     for i, (number, kind, name) in sorted(self.phonebook.items()) if first <= i <= last]
+            self.emit(*lines, "OK")
+        elif cmd.startswith("AT+CPBW="):
+            match = re.match(r'AT\+CPBW=(\d+)(?:,"([^"]*)",(\d+),"([^"]*)")?$', line, re.IGNORECASE)
+            if not match or not 1 <= int(match.group(1)) <= self.phonebook_size:
+                self.emit("ERROR")
+                return
+            index, number, kind, name = match.groups()
+            if number is None:
+                self.phonebook.pop(int(index), None)
+            else:
+                self.phonebook[int(index)] = (number, int(kind), name[:14])
+            self.emit("OK")
+        elif cmd == "AT+CCID":
+            self.emit(self.iccid, "OK")
+        elif cmd == "AT&W":
+            self.saved_baud_rate = self.baud_rate
+            self.emit("OK")
+        elif cmd.startswith("AT"):
+            self.emit("OK")
+        else:
+            self.emit("ERROR")
+
+
+if __name__ == "__main__":
+    modem = SimulatedModem().start()
+    print(f"Simulated SIM800L listening on {modem.port} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        modem.stop()
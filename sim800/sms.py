@@ -0,0 +1,58 @@
+import re
+
+
+def set_text_mode(at):
+    """
+    Switch the modem to SMS text mode (AT+CMGF=1).
+    """
+    at.command("AT+CMGF=1")
+
+
+def send_sms(at, phone_number, message, timeout=60, text_mode=True):
+    """
+    Send an SMS in text mode and return the +CMGS message reference.
+    Pass text_mode=False when the session is already in text mode.
+    Raises ATError if the modem rejects it, and ValueError if the text holds
+    Ctrl+Z or Esc, which would end or cancel the message early.
+    """
+    if "\x1a" in message or "\x1b" in message:
+        raise ValueError("SMS text must not contain Ctrl+Z or Esc characters")
+    if text_mode:
+        set_text_mode(at)
+    lines = at.command(f'AT+CMGS="{phone_number}"', timeout=timeout, payload=message)
+    for line in lines:
+        if line.startswith("+CMGS:"):
+            return int(line.split(":")[1])
+    return None
+
+
+def parse_cmgl(lines):
+    """
+    Parse an AT+CMGL response into a list of message dicts.
+    """
+    messages = []
+    for line in lines:
+        match = re.match(r'\+CMGL: (\d+),"([^"]*)","([^"]*)","[^"]*","([^"]*)"', line)
+        if match:
+            index, status, number, timestamp = match.groups()
+            messages.append({"index": int(index), "status": status, "number": number,
+                             "timestamp": timestamp, "text": ""})
+        elif messages and line != "OK":
+            current = messages[-1]
+            current["text"] = line if not current["text"] else current["text"] + "\n" + line
+    return messages
+
+
+def list_messages(at, status="ALL", timeout=20):
+    """
+    Read the messages stored on the SIM (AT+CMGL) as dicts.
+    """
+    set_text_mode(at)
+    return parse_cmgl(at.command(f'AT+CMGL="{status}"', timeout=timeout))
+
+
+def delete_message(at, index):
+    """
+    Delete one stored message by index.
+    """
+    at.command(f"AT+CMGD={index}")
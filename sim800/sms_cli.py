@@ -0,0 +1,115 @@
+"""
+Send SMS from the command line or from scripts and cron jobs.
+
+    sms send +995557598200 "Hello from the Pi"
+    echo "Hello" | sms send +995557598200 -
+    sms bulk --file messages.csv        (rows of: number,message)
+    sms bulk --file - < messages.csv
+
+No root is needed: the serial port is opened with the caller's group
+permissions (add the user to the "dialout" group once). Readiness is checked
+by polling AT, and a bulk run streams every message through one session.
+"""
+import argparse
+import csv
+import errno
+import sys
+import time
+
+from sim800.at import connect
+from sim800.sms import send_sms, set_text_mode
+from sim800.transport import BAUD_RATE, SERIAL_PORT
+
+
+def read_rows(stream):
+    """
+    Yield (number, message) pairs from CSV rows, skipping blank rows,
+    comments and a "number,message" header. Extra columns are treated as
+    part of an unquoted message that contained commas.
+    """
+    for row in csv.reader(stream):
+        if not row or not row[0].strip() or row[0].startswith("#"):
+            continue
+        if row[0].strip().lower() == "number":
+            continue
+        if len(row) < 2:
+            print(f"Skipping row without a message: {row!r}", file=sys.stderr)
+            continue
+        yield row[0].strip(), ",".join(row[1:])
+
+
+def open_modem(args):
+    """
+    Connect to the modem, turning a permission error into a setup hint.
+    """
+    try:
+        at = connect(args.port, args.baud, timeout=args.ready_timeout)
+    except Exception as e:
+        # pyserial wraps the OSError, so look at errno rather than the type
+        if isinstance(e, PermissionError) or getattr(e, "errno", None) == errno.EACCES:
+            sys.exit(f"No permission to open {args.port}. Add your user to the dialout group "
+                     f"(sudo usermod -aG dialout $USER) and log in again.")
+        sys.exit(f"Modem not available on {args.port}: {e}")
+    set_text_mode(at)
+    return at
+
+
+def send_all(at, rows):
+    """
+    Send each (number, message) through the open session and print per-message timing.
+    Returns (sent, failed).
+    """
+    sent = failed = 0
+    batch_start = time.perf_counter()
+    for number, message in rows:
+        start = time.perf_counter()
+        try:
+            reference = send_sms(at, number, message, text_mode=False)
+            sent += 1
+            print(f"OK    {number}  ref={reference}  {time.perf_counter() - start:.2f} s")
+        except Exception as e:
+            failed += 1
+            print(f"FAIL  {number}  {e}  {time.perf_counter() - start:.2f} s")
+        sys.stdout.flush()
+    total = time.perf_counter() - batch_start
+    if sent + failed > 1:
+        print(f"{sent} sent, {failed} failed in {total:.2f} s "
+              f"({total / (sent + failed):.2f} s per message)")
+    return sent, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="sms", description="Send SMS through the SIM800L.")
+    parser.add_argument("--port", default=SERIAL_PORT, help=f"serial port (default {SERIAL_PORT})")
+    parser.add_argument("--baud", type=int, default=BAUD_RATE, help=f"baud rate (default {BAUD_RATE})")
+    parser.add_argument("--ready-timeout", type=float, default=10.0,
+                        help="seconds to wait for the modem to answer AT")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    send = commands.add_parser("send", help="send one message")
+    send.add_argument("number")
+    send.add_argument("message", help='message text, or "-" to read it from stdin')
+
+    bulk = commands.add_parser("bulk", help="send messages from a CSV file of number,message rows")
+    bulk.add_argument("--file", required=True, help='CSV file, or "-" for stdin')
+
+    args = parser.parse_args(argv)
+    start = time.perf_counter()
+    at = open_modem(args)
+    print(f"Modem ready in {time.perf_counter() - start:.2f} s")
+    try:
+        if args.command == "send":
+            message = sys.stdin.read().rstrip("\n") if args.message == "-" else args.message
+            sent, failed = send_all(at, [(args.number, message)])
+        elif args.file == "-":
+            sent, failed = send_all(at, read_rows(sys.stdin))
+        else:
+            with open(args.file, newline="") as f:
+                sent, failed = send_all(at, read_rows(f))
+    finally:
+        at.close()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
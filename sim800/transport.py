@@ -0,0 +1,99 @@
+import threading
+
+import serial
+
+# --- SIM800L Serial Configuration ---
+SERIAL_PORT = '/dev/ttyS0'  # Update as needed (/dev/serial0, /dev/ttyAMA0, /dev/ttyUSB0 ...)
+BAUD_RATE = 9600
+TARGET_BAUD_RATE = None     # e.g. 115200 to switch the modem up with AT+IPR on connect
+BAUD_CANDIDATES = (115200, 57600, 38400, 19200, 9600)  # Tried in order when autobauding
+READ_TIMEOUT = 0.05         # Serial read timeout; bounds how quickly the reader notices close()
+
+
+class SerialTransport:
+    """
+    Owns the serial port and a reader thread that splits incoming bytes into
+    lines and hands each one to on_line. The SMS prompt "> " arrives without a
+    line ending and is delivered as the line ">".
+    """
+
+    def __init__(self, port=SERIAL_PORT, baud_rate=BAUD_RATE):
+        self.port = port
+        self.baud_rate = baud_rate
+        self.ser = None
+        self.on_line = None
+        self.thread = None
+        self.running = False
+        self.write_lock = threading.Lock()
+        self.generation = 0         # Bumped on every speed change so the reader drops partial lines
+
+    def open(self):
+        """
+        Open the port and start the reader thread.
+        """
+        self.ser = serial.Serial(self.port, self.baud_rate, timeout=READ_TIMEOUT)
+        self.running = True
+        self.thread = threading.Thread(target=self._read_loop, daemon=True)
+        self.thread.start()
+        return self
+
+    def close(self):
+        """
+        Stop the reader thread and close the port.
+        """
+        self.running = False
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join(timeout=1)
+        if self.ser is not None and self.ser.is_open:
+            self.ser.close()
+
+    @property
+    def is_open(self):
+        return self.ser is not None and self.ser.is_open
+
+    def set_baud_rate(self, baud_rate):
+        """
+        Change the port speed in place and drop anything received at the old speed.
+        """
+        with self.write_lock:
+            self.ser.baudrate = baud_rate
+            self.baud_rate = baud_rate
+            self.ser.reset_input_buffer()
+            self.generation += 1
+
+    def write(self, data):
+        with self.write_lock:
+            self.ser.write(data)
+            self.ser.flush()
+
+    def _read_loop(self):
+        buffer = b""
+        generation = self.generation
+        while self.running:
+            try:
+                data = self.ser.read(self.ser.in_waiting or 1)
+            except (serial.SerialException, OSError, TypeError) as e:
+                if self.running:
+                    print("Error reading from serial:", e)
+                break
+            if not data:
+                continue
+            if generation != self.generation:
+                generation = self.generation
+                buffer = b""
+            buffer += data
+            while b"\n" in buffer:
+                raw, buffer = buffer.split(b"\n", 1)
+                line = raw.decode(errors="ignore").strip()
+                if line:
+                    self._deliver(line)
+            if buffer.strip() == b">":
+                buffer = b""
+                self._deliver(">")
+
+    def _deliver(self, line):
+        if self.on_line is not None:
+            try:
+                self.on_line(line)
+            except Exception as e:
+                print("Error handling serial line:", e)
@@ -0,0 +1,239 @@
+"""
+Voicemail for unanswered calls and transcripts of answered ones.
+
+Voicemail answers an incoming call with ATA after VOICEMAIL_RINGS rings,
+plays a greeting (decoded into memory at startup) into the Bluetooth sink
+that carries our side of the call to the modem, records the caller through
+the call loopback with CallRecorder, and hands the recording to a
+RecognitionService worker once the call ends. Without a greeting file it
+does not answer at all, rather than picking up to silence. The transcript is stored
+with the call's record in the call log.
+
+CallTranscriber transcribes both directions of an answered call live, one
+recognition stream per direction, and stores the conversation the same way.
+Both decode on background threads with the already loaded model, so the
+mic loop is never kept waiting.
+"""
+import shutil
+import subprocess
+import threading
+import time
+
+import numpy as np
+
+from sim800.audio_routing import BT_SINK, CALL_TAPS
+from sim800.recognition import ParecSource, WavSource
+
+# --- Voicemail Configuration ---
+VOICEMAIL_RINGS = 4                            # Answer after this many rings
+GREETING_FILE = "sounds/voicemail_greeting.wav"  # Not shipped; record your own (any WAV rate, mono or stereo)
+GREETING_SINK = BT_SINK                        # PulseAudio sink that reaches the caller
+GREETING_RATE = 16000
+MAX_MESSAGE_SECONDS = 60
+VOICEMAIL_DIR = "recordings/voicemail"
+CALLER_TAP = CALL_TAPS[0]                      # Sink the far end is played into
+OWN_TAP = CALL_TAPS[1]                         # Sink our side is sent to the modem through
+
+
+class Voicemail:
+    """
+    Take a message when nobody answers. Attach with attach(calls).
+    start_audio(label) and release_audio() load and unload the call
+    loopbacks (the assistant's start_call_audio / release_call_audio).
+    """
+
+    def __init__(self, service, call_log=None, rings=VOICEMAIL_RINGS, greeting=GREETING_FILE,
+                 max_seconds=MAX_MESSAGE_SECONDS, start_audio=None, release_audio=None):
+        self.service = service
+        self.call_log = call_log
+        self.rings = rings
+        self.greeting = greeting
+        self.max_seconds = max_seconds
+        self.start_audio = start_audio
+        self.release_audio = release_audio
+        self.calls = None
+        self.busy = False
+        self.greeting_pcm = None
+        self.player = None
+        self.lock = threading.Lock()
+
+    def attach(self, calls):
+        """
+        Start answering calls on this CallManager. Without a usable greeting
+        voicemail stays off and attach() returns None.
+        """
+        self.calls = calls
+        if shutil.which("pacat") is None:
+            print("Voicemail off: pacat (pulseaudio-utils) is needed to play the greeting.")
+            return None
+        if not self._load_greeting():
+            print(f"Voicemail off: no greeting at {self.greeting}.")
+            return None
+        calls.add_listener(self.on_call_event)
+        return self
+
+    @property
+    def playing(self):
+        """
+        True while the greeting is playing (an echo gate source).
+        """
+        player = self.player
+        return player is not None and player.poll() is None
+
+    def _load_greeting(self):
+        """
+        Decode the greeting once, so answering does not wait on disk or decoding.
+        """
+        try:
+            from sim800.playback import decode_wav
+            samples = decode_wav(self.greeting, GREETING_RATE)
+        except Exception as e:
+            print("Voicemail greeting unavailable:", e)
+            return False
+        self.greeting_pcm = (np.clip(samples, -1.0, 1.0) * 32767.0).astype("<i2").tobytes()
+        return True
+
+    def play_greeting(self, timeout=30):
+        """
+        Play the greeting into GREETING_SINK with pacat and wait for it to finish.
+        """
+        self.player = subprocess.Popen(["pacat", "--playback", f"--device={GREETING_SINK}", "--format=s16le",
+                                        f"--rate={GREETING_RATE}", "--channels=1"], stdin=subprocess.PIPE)
+        try:
+            self.player.communicate(self.greeting_pcm, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            self.player.kill()
+            self.player.wait()
+
+    def on_call_event(self, event, calls):
+        if event != "ring" or calls.ring_count < self.rings:
+            return
+        with self.lock:
+            if self.busy:
+                return
+            self.busy = True
+        threading.Thread(target=self._take_message, daemon=True).start()
+
+    def _take_message(self):
+        calls = self.calls
+        recorder = None
+        audio = False
+        try:
+            if not calls.incoming:
+                return  # Answered by voice in the meantime
+            number = calls.number or "unknown"
+            started = self.call_log.current_started() if self.call_log is not None else None
+            if self.start_audio is not None:
+                self.start_audio(f"voicemail_{number}")
+                audio = True
+            if not calls.answer():
+                return
+            print(f"Voicemail answered a call from {number}")
+            self.play_greeting()
+            if calls.state != "active":
+                return
+            from sim800.recorder import CallRecorder
+            recorder = CallRecorder(number, taps=(CALLER_TAP,), directory=VOICEMAIL_DIR, codec="wav")
+            recorder.start()
+            if not calls.wait_end(self.max_seconds):
+                calls.hang_up("voicemail timeout")
+        except Exception as e:
+            print("Voicemail error:", e)
+        finally:
+            if recorder is not None:
+                recorder.stop()
+            if audio and self.release_audio is not None:
+                self.release_audio()
+            with self.lock:
+                self.busy = False
+        if recorder is not None and recorder.paths:
+            self.transcribe(recorder.paths, started, number)
+
+    def transcribe(self, paths, started=None, number=None):
+        """
+        Transcribe recorded WAV chunks on a recognition worker and store the
+        text with the call record once done.
+        """
+        texts = []
+        remaining = iter(paths)
+        current = [None]
+        stream = {}
+        start = time.monotonic()
+
+        def read():
+            while True:
+                if current[0] is None:
+                    path = next(remaining, None)
+                    if path is None:
+                        return b""
+                    current[0] = WavSource(path)
+                data = current[0].read()
+                if data:
+                    return data
+                current[0] = None
+
+        def on_end(name):
+            transcript = " ".join(texts)
+            elapsed = time.monotonic() - start
+            audio = stream["stream"].audio_seconds if stream else 0.0
+            print(f"Voicemail from {number}: {transcript or '(nothing recognized)'} "
+                  f"({audio:.0f} s transcribed in {elapsed:.1f} s)")
+            if self.call_log is not None and started is not None:
+                self.call_log.set_transcript(started, transcript)
+
+        stream["stream"] = self.service.add_stream(f"voicemail {paths[0]}", read,
+                                                   lambda name, result: texts.append(result["text"]),
+                                                   words=False, on_end=on_end)
+
+
+class CallTranscriber:
+    """
+    Transcribe answered calls live, caller and our side on separate streams,
+    and store the conversation with the call record when the call ends.
+    skip() returning True leaves a call alone (e.g. while voicemail has it).
+    """
+
+    def __init__(self, service, call_log=None, skip=None):
+        self.service = service
+        self.call_log = call_log
+        self.skip = skip
+        self.sources = []
+        self.lines = []
+        self.started = None
+        self.lock = threading.Lock()
+
+    def attach(self, calls):
+        calls.add_listener(self.on_call_event)
+        return self
+
+    def on_call_event(self, event, calls):
+        if event == "active" and not (self.skip and self.skip()):
+            self.started = self.call_log.current_started() if self.call_log is not None else None
+            self.lines = []
+            for label, tap in (("caller", CALLER_TAP), ("me", OWN_TAP)):
+                try:
+                    source = ParecSource(tap)
+                except OSError as e:
+                    print("Call transcription unavailable:", e)
+                    break
+                self.sources.append(source)
+                self.service.add_stream(f"call {label}", source.read, self._on_result, words=False)
+        elif event == "ended" and self.sources:
+            threading.Thread(target=self._finish, daemon=True).start()
+
+    def _on_result(self, name, result):
+        line = f"{name.split()[-1]}: {result['text']}"
+        print("Transcript", line)
+        with self.lock:
+            self.lines.append(line)
+
+    def _finish(self):
+        sources, self.sources = self.sources, []
+        for source in sources:
+            source.close()  # Ends the stream; its worker flushes the last words
+        for label in ("caller", "me"):
+            self.service.wait(f"call {label}", timeout=5)
+        with self.lock:
+            transcript = "\n".join(self.lines)
+        if self.call_log is not None and self.started is not None and transcript:
+            self.call_log.set_transcript(self.started, transcript)
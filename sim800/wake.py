@@ -0,0 +1,86 @@
+"""
+Wake word gate in front of the command recognizer.
+
+A second KaldiRecognizer on the same model is restricted to a one-word
+grammar, so it only ever decides between the wake word and "[unk]". It
+listens all the time (skipping blocks too quiet to hold speech, and starting
+a fresh utterance after a quiet pause, since a skipped block is silence the
+recognizer never sees and cannot end an utterance on); when it hears the
+wake word, audio is handed to the full command recognizer for
+WAKE_WINDOW seconds. The assistant extends the window while a command is
+still being spoken and after one is handled. Nothing said outside the
+window can trigger an action.
+"""
+import json
+
+import numpy as np
+
+# --- Wake Word Configuration ---
+WAKE_WORD = "computer"         # Must be in the model's vocabulary
+WAKE_WINDOW = 5.0              # Seconds the command recognizer listens after the wake word
+WAKE_MIN_RMS = 200.0           # Blocks quieter than this are not decoded at all
+WAKE_RESET_SILENCE = 0.5       # Seconds of skipped blocks that end the utterance being decoded
+SAMPLE_RATE = 16000
+
+
+class WakeWordGate:
+    """
+    Feed every mic block to feed(); it returns the block while the command
+    window is open (including the block the wake word was heard in, so
+    "computer call" in one breath still works) and None otherwise.
+    """
+
+    def __init__(self, model, wake_word=WAKE_WORD, window=WAKE_WINDOW, min_rms=WAKE_MIN_RMS,
+                 sample_rate=SAMPLE_RATE, reset_silence=WAKE_RESET_SILENCE):
+        from vosk import KaldiRecognizer
+        self.wake_word = wake_word
+        self.window = int(window * sample_rate)
+        self.min_rms = min_rms
+        self.reset_silence = int(reset_silence * sample_rate)
+        self.recognizer = KaldiRecognizer(model, sample_rate, json.dumps([wake_word, "[unk]"]))
+        self.remaining = 0             # Samples left in the open window
+        self.quiet = 0                 # Samples skipped since the last decoded block
+        self.in_utterance = False      # The recognizer holds audio it has not finalized
+        self.detections = 0
+        self.decoded_blocks = 0
+        self.skipped_blocks = 0
+
+    @property
+    def awake(self):
+        return self.remaining > 0
+
+    def extend(self):
+        """
+        Keep the window open for another full WAKE_WINDOW, e.g. while the
+        command recognizer still has a partial result or after a command was handled.
+        """
+        self.remaining = self.window
+
+    def feed(self, data):
+        samples = len(data) // 2
+        if self.awake:
+            self.remaining = max(0, self.remaining - samples)
+            return data
+        block = np.frombuffer(data, dtype="<i2").astype(np.float32)
+        if not len(block) or float(np.sqrt(np.mean(block * block))) < self.min_rms:
+            self.skipped_blocks += 1
+            self.quiet += samples
+            if self.in_utterance and self.quiet >= self.reset_silence:
+                self.recognizer.Reset()
+                self.in_utterance = False
+            return None
+        self.quiet = 0
+        self.in_utterance = True
+        self.decoded_blocks += 1
+        if self.recognizer.AcceptWaveform(data):
+            self.in_utterance = False
+            text = json.loads(self.recognizer.Result()).get("text", "")
+        else:
+            text = json.loads(self.recognizer.PartialResult()).get("partial", "")
+        if self.wake_word not in text.split():
+            return None
+        self.recognizer.Reset()
+        self.in_utterance = False
+        self.detections += 1
+        self.remaining = self.window
+        return data
@@ -1,10 +1,9 @@
-import simpleaudio as sa
+from sim800.playback import close_engine, play_file, report_latency
 
-# Load the WAV file
-wave_obj = sa.WaveObject.from_wave_file("test.wav")
-
-# Play the audio
-play_obj = wave_obj.play()
+# Play the WAV file (decoded once and kept in memory by the engine)
+voice = play_file("test.wav", wait=False)
 
 # Wait until the audio finishes playing
-play_obj.wait_done()
+voice.wait()
+report_latency(voice)
+close_engine()
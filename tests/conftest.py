@@ -0,0 +1,47 @@
+import pytest
+
+import sim800.at
+from sim800.at import connect
+from sim800.call import CallManager
+from sim800.simulator import SimulatedModem
+
+
+@pytest.fixture(autouse=True)
+def baud_cache(tmp_path, monkeypatch):
+    """
+    Keep connect() from writing the baud rate cache in the home directory.
+    """
+    monkeypatch.setattr(sim800.at, "BAUD_CACHE_FILE", str(tmp_path / "baud.json"))
+
+
+@pytest.fixture
+def open_modem():
+    """
+    Start a SimulatedModem with the given options and connect to it.
+    Returns (simulator, ATEngine); both are closed after the test.
+    """
+    opened = []
+
+    def start(**options):
+        sim = SimulatedModem(**options).start()
+        at = connect(sim.port, 115200, target_baud=None, autobaud=False)
+        opened.append((sim, at))
+        return sim, at
+
+    yield start
+    for sim, at in opened:
+        at.close()
+        sim.stop()
+
+
+@pytest.fixture
+def call_setup(open_modem):
+    """
+    (simulator, ATEngine, CallManager) with caller ID and call reports on.
+    Outgoing calls ring until the test calls remote_answer() or remote_reject().
+    """
+    sim, at = open_modem(sms_delay=0.3, dial_delay=0.0, answer_delay=None)
+    calls = CallManager(at)
+    calls.enable_caller_id()
+    calls.enable_call_reports()
+    return sim, at, calls
@@ -0,0 +1,102 @@
+"""
+Control API request handling, against a backend that records its calls.
+"""
+import asyncio
+import json
+
+import pytest
+
+from sim800.api import ControlAPI
+
+
+class RecordingBackend:
+    def __init__(self):
+        self.calls = []
+
+    def dial(self, number, duration=None):
+        self.calls.append(("dial", number, duration))
+        return {"dialing": number}
+
+    def send_sms(self, number, text):
+        self.calls.append(("sms", number, text))
+        return {"reference": 1}
+
+
+class NullLog:
+    def write(self, entry):
+        pass
+
+
+def post(api, path, body):
+    return asyncio.run(dispatch(api, "POST", path, json.dumps(body).encode()))
+
+
+async def dispatch(api, method, path, body):
+    api.loop = asyncio.get_running_loop()
+    return await api._dispatch(method, path, body)
+
+
+@pytest.fixture
+def api():
+    return ControlAPI(RecordingBackend(), log=NullLog())
+
+
+@pytest.mark.parametrize("body", [
+    {"number": "+995555123456", "duration": "2"},
+    {"number": "+995555123456", "duration": 0},
+    {"number": "+995555123456", "duration": True},
+    {"number": "123;H"},
+    {},
+])
+def test_dial_rejects_bad_input(api, body):
+    assert post(api, "/dial", body)[0] == 400
+    assert api.backend.calls == []
+
+
+def test_dial_accepts_number_and_duration(api):
+    assert post(api, "/dial", {"number": "+995555123456", "duration": 12.5})[0] == 200
+    assert api.backend.calls == [("dial", "+995555123456", 12.5)]
+
+
+@pytest.mark.parametrize("body", [
+    {"number": '123"\r\nATH', "text": "hi"},
+    {"number": "+995555123456"},
+    {"text": "hi"},
+])
+def test_sms_rejects_bad_input(api, body):
+    assert post(api, "/sms", body)[0] == 400
+    assert api.backend.calls == []
+
+
+def test_sms_accepts_number_and_text(api):
+    assert post(api, "/sms", {"number": "+995555123456", "text": "hi"})[0] == 200
+    assert api.backend.calls == [("sms", "+995555123456", "hi")]
+
+
+async def raw_request(api, request):
+    await api.start()
+    try:
+        reader, writer = await asyncio.open_connection(api.host, api.port)
+        writer.write(request)
+        await writer.drain()
+        response = await asyncio.wait_for(reader.read(), timeout=2)
+        writer.close()
+        return response
+    finally:
+        api.server.close()
+        await api.server.wait_closed()
+
+
+@pytest.mark.parametrize("length", ["abc", "-5", "1e3"])
+def test_bad_content_length_is_answered_with_400(api, length):
+    api.port = 0
+    request = f"POST /sms HTTP/1.1\r\nContent-Length: {length}\r\n\r\n{{}}".encode()
+    response = asyncio.run(raw_request(api, request))
+    assert response.startswith(b"HTTP/1.1 400 ")
+    assert api.backend.calls == []
+
+
+def test_oversized_body_is_answered_with_413(api):
+    api.port = 0
+    request = b"POST /sms HTTP/1.1\r\nContent-Length: 99999999\r\n\r\n"
+    assert asyncio.run(raw_request(api, request)).startswith(b"HTTP/1.1 413 ")
@@ -0,0 +1,90 @@
+"""
+CallManager call state against the SIM800L simulator.
+"""
+import threading
+import time
+
+import sim800.call
+from sim800.sms import send_sms
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_call_end_is_seen_while_another_command_runs(call_setup):
+    sim, at, calls = call_setup
+    calls.dial("+995555111111")
+    sim.remote_answer()
+    assert wait_for(lambda: calls.active)
+    threading.Timer(0.1, sim.remote_hang_up).start()
+    assert send_sms(at, "+995555222222", "hello") == 1
+    assert calls.wait_end(2)
+    assert calls.state == "idle"
+    assert calls.end_reason == "NO CARRIER"
+
+
+def test_call_report_alone_ends_the_call(call_setup):
+    sim, at, calls = call_setup
+    sim.final_on_hang_up = False
+    calls.dial("+995555111111")
+    sim.remote_answer()
+    assert wait_for(lambda: calls.active)
+    sim.remote_hang_up()
+    assert calls.wait_end(2)
+    assert calls.state == "idle"
+    assert calls.end_reason == "disconnected"
+
+
+def test_disconnect_grace_timer_does_not_end_the_next_call(call_setup):
+    sim, at, calls = call_setup
+    calls.dial("+995555111111")
+    sim.remote_answer()
+    assert wait_for(lambda: calls.active)
+    sim.remote_hang_up()
+    assert wait_for(lambda: calls.state == "idle")
+    assert calls.dial("+995555222222")
+    sim.remote_answer()
+    assert wait_for(lambda: calls.active)
+    time.sleep(sim800.call.CLCC_GRACE * 4)
+    assert calls.active
+    assert not calls.ended.is_set()
+    assert calls.end_reason is None
+
+
+def test_incoming_call_answered(call_setup):
+    sim, at, calls = call_setup
+    events = []
+    calls.add_listener(lambda event, manager: events.append(event))
+    sim.ring("+995555333333")
+    assert wait_for(lambda: calls.incoming and calls.number == "+995555333333")
+    assert calls.answer()
+    assert calls.active
+    assert events == ["incoming", "ring", "active"]
+
+
+def test_ring_after_a_call_starts_clean(call_setup):
+    sim, at, calls = call_setup
+    calls.dial("+995555111111")
+    sim.remote_answer()
+    assert wait_for(lambda: calls.active)
+    sim.remote_hang_up()
+    assert calls.wait_end(2)
+    seen = []
+
+    def on_event(event, manager):
+        if event == "incoming":
+            seen.append((manager.ended.is_set(), manager.end_reason))
+
+    calls.add_listener(on_event)
+    sim.ring("+995555333333")
+    assert wait_for(lambda: calls.incoming)
+    assert not calls.wait_end(0)
+    assert calls.end_reason is None
+    assert wait_for(lambda: seen)
+    assert seen == [(False, None)]
@@ -0,0 +1,59 @@
+"""
+Call state and call detail records as the call log sees them.
+"""
+import time
+
+import sim800.call
+from sim800.cdr import CallLog
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_outgoing_call_is_dialing_until_answered(call_setup):
+    sim, at, calls = call_setup
+    assert calls.dial("+995555111111")
+    time.sleep(0.1)
+    assert calls.state == "dialing"
+    sim.remote_answer()
+    assert wait_for(lambda: calls.state == "active")
+    sim.remote_hang_up()
+    assert calls.wait_end(2)
+    assert calls.end_reason == "NO CARRIER"
+
+
+def test_unanswered_incoming_call_is_missed(call_setup, monkeypatch):
+    monkeypatch.setattr(sim800.call, "RING_TIMEOUT", 0.2)
+    sim, at, calls = call_setup
+    sim.ring()
+    assert wait_for(lambda: calls.incoming)
+    assert calls.wait_end(2)
+    assert calls.end_reason == "missed"
+
+
+def test_call_log_records_answered_and_busy_calls(call_setup, tmp_path):
+    sim, at, calls = call_setup
+    log = CallLog(str(tmp_path / "calls.db")).attach(calls)
+    calls.dial("+995555111111")
+    time.sleep(0.1)
+    sim.remote_reject("BUSY")
+    assert calls.wait_end(2)
+    calls.dial("+995555222222")
+    time.sleep(0.1)
+    sim.remote_answer()
+    assert wait_for(lambda: calls.active)
+    calls.hang_up()
+    log.close()
+
+    answered, busy = CallLog(str(tmp_path / "calls.db")).history()
+    assert (busy["number"], busy["answered"], busy["end_reason"]) == ("+995555111111", 0, "BUSY")
+    assert busy["setup_latency"] is None and busy["duration"] == 0.0
+    assert (answered["number"], answered["answered"]) == ("+995555222222", 1)
+    assert answered["setup_latency"] >= 0.1
+    assert log.last_number("outgoing") == "+995555222222"
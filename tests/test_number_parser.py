@@ -0,0 +1,67 @@
+"""
+Spoken number parsing and multi-utterance number entry.
+"""
+from sim800.number_parser import NumberEntry, parse_digits, words_from_result
+
+
+def words(text, conf=1.0):
+    return [(w, conf) for w in text.split()]
+
+
+def test_words_from_result_prefers_word_confidences():
+    result = {"text": "five six", "result": [{"word": "five", "conf": 0.9}, {"word": "six", "conf": 0.4}]}
+    assert words_from_result(result) == [("five", 0.9), ("six", 0.4)]
+    assert words_from_result({"text": "five six"}) == [("five", 1.0), ("six", 1.0)]
+
+
+def test_spoken_number_forms():
+    assert parse_digits("double five fifty five five hundred twelve nine hundred five") == "5555512905"
+    assert parse_digits("oh triple seven fifteen twenty") == "07771520"
+
+
+def test_too_many_digits_then_back():
+    entry = NumberEntry()
+    reply = entry.feed(words("five five five one two three four five six seven"))
+    assert reply.startswith("That is 10 digits, 9 expected.")
+    assert not entry.complete
+    assert entry.feed(words("back")) == "So far: 5 5 5 1 2 3 4 5 6"
+    entry.feed(words("done"))
+    assert entry.complete
+    assert entry.full_number() == "+995555123456"
+
+
+def test_low_confidence_group_is_rejected():
+    entry = NumberEntry()
+    entry.feed(words("five five five"))
+    reply = entry.feed(words("one two", conf=0.3))
+    assert reply.startswith("I did not catch that.")
+    assert entry.digits == "555"
+
+
+def test_clear_and_repeat():
+    entry = NumberEntry()
+    entry.feed(words("five five"))
+    assert entry.feed(words("clear")) == "Cleared. Tell me number"
+    assert entry.feed(words("repeat")) == "no digits yet"
+
+
+def test_international_with_plus():
+    entry = NumberEntry()
+    entry.feed(words("plus four four"))
+    assert entry.feed(words("done")).startswith("The international number is too short.")
+    entry.feed(words("two zero seven nine four six done"))
+    assert entry.complete
+    assert entry.full_number() == "+44207946"
+
+
+def test_international_with_double_zero_and_done_in_one_utterance():
+    entry = NumberEntry()
+    assert entry.feed(words("zero zero four nine one two three four done")) == ""
+    assert entry.complete
+    assert entry.full_number() == "+491234"
+
+
+def test_national_number_needs_all_digits_before_done():
+    entry = NumberEntry()
+    assert entry.feed(words("five five five done")) == "I need 9 digits. So far: 5 5 5"
+    assert not entry.complete
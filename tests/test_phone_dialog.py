@@ -0,0 +1,103 @@
+"""
+The phone dialog, driven by text alone.
+"""
+from sim800.phone_dialog import build_phone_dialog
+
+
+class FakeActions:
+    """
+    Records what the dialog asks for instead of touching the modem.
+    """
+
+    def __init__(self, last=None, incoming=False, in_call=False):
+        self.spoken = []
+        self.dialed = []
+        self.saved = []
+        self.last = last or {}
+        self.incoming = incoming
+        self.in_call = in_call
+
+    def speak(self, text):
+        self.spoken.append(text)
+
+    def dial(self, number):
+        self.dialed.append(number)
+
+    def answer(self):
+        return self.incoming
+
+    def hang_up(self):
+        return self.in_call
+
+    def save_contact(self, name, number):
+        self.saved.append((name, number))
+
+    def last_number(self, direction):
+        return self.last.get(direction)
+
+
+def test_call_collects_digits_over_several_utterances():
+    actions = FakeActions()
+    dialog = build_phone_dialog(actions)
+    dialog.handle("call")
+    assert dialog.state == "dial_number"
+    dialog.handle("five five five")
+    dialog.handle("one two three")
+    assert actions.dialed == []
+    dialog.handle("four five six")
+    assert actions.dialed == ["+995555123456"]
+    assert actions.spoken[-1] == "Calling number 5 5 5, 1 2 3, 4 5 6"
+    assert dialog.state == "idle"
+
+
+def test_call_correction_removes_last_group():
+    actions = FakeActions()
+    dialog = build_phone_dialog(actions)
+    dialog.handle("call")
+    dialog.handle("five five five")
+    dialog.handle("nine nine nine")
+    dialog.handle("correction")
+    assert actions.spoken[-1] == "Removed the last digits. So far: 5 5 5"
+    dialog.handle("one two three four five six")
+    assert actions.dialed == ["+995555123456"]
+
+
+def test_redial_and_call_back():
+    actions = FakeActions(last={"outgoing": "+995555000001"})
+    dialog = build_phone_dialog(actions)
+    dialog.handle("redial")
+    assert actions.dialed == ["+995555000001"]
+    dialog.handle("call back")
+    assert actions.spoken[-1] == "No recent caller to call back"
+    assert actions.dialed == ["+995555000001"]
+    assert dialog.state == "idle"
+
+
+def test_save_number_then_spell_name():
+    actions = FakeActions()
+    dialog = build_phone_dialog(actions)
+    dialog.handle("save number")
+    dialog.handle("five five five one two three four five six")
+    assert dialog.state == "save_name"
+    dialog.handle("a")
+    dialog.handle("b. c")
+    dialog.handle("done")
+    assert actions.saved == [("ABC", "555123456")]
+    assert dialog.state == "idle"
+
+
+def test_answer_and_hang_up_without_a_call():
+    actions = FakeActions()
+    dialog = build_phone_dialog(actions)
+    dialog.handle("yes")
+    dialog.handle("hang up")
+    assert actions.spoken == ["No incoming call to answer", "No active call to hang up"]
+
+
+def test_hang_up_works_during_number_entry():
+    actions = FakeActions(in_call=True)
+    dialog = build_phone_dialog(actions)
+    dialog.handle("call")
+    dialog.handle("hang up")
+    assert actions.spoken == ["Tell me number"]
+    assert dialog.state == "dial_number"
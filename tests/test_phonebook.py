@@ -0,0 +1,104 @@
+"""
+Two-way SIM phonebook sync against the simulator.
+"""
+import pytest
+
+from sim800.contacts import load_contacts, write_contacts
+from sim800.phonebook import sync_phonebook
+
+
+@pytest.fixture
+def files(tmp_path):
+    return str(tmp_path / "saved_numbers.txt"), str(tmp_path / "phonebook_sync.json")
+
+
+def sim_entries(sim):
+    return {name: number for number, _, name in sim.phonebook.values()}
+
+
+def synced_pair(open_modem, files):
+    """
+    A SIM and a contact file holding the same two contacts after one sync.
+    """
+    contacts_file, state_file = files
+    sim, at = open_modem()
+    write_contacts({"ANNA": "555111111", "BOB": "+995555222222"}, contacts_file)
+    sync_phonebook(at, contacts_file, state_file)
+    return sim, at
+
+
+def test_first_sync_merges_both_sides(open_modem, files):
+    contacts_file, state_file = files
+    sim, at = open_modem()
+    sim.phonebook[1] = ("555333333", 129, "CARL")
+    write_contacts({"ANNA": "555111111"}, contacts_file)
+    stats = sync_phonebook(at, contacts_file, state_file)
+    assert (stats["to_sim"], stats["to_local"]) == (1, 1)
+    assert sim_entries(sim) == {"CARL": "555333333", "ANNA": "555111111"}
+    assert load_contacts(contacts_file) == {"ANNA": "555111111", "CARL": "555333333"}
+    assert sync_phonebook(at, contacts_file, state_file)["unchanged"] == 2
+
+
+def test_local_edit_is_copied_to_sim(open_modem, files):
+    contacts_file, state_file = files
+    sim, at = synced_pair(open_modem, files)
+    write_contacts({"ANNA": "555999999", "BOB": "+995555222222"}, contacts_file)
+    assert sync_phonebook(at, contacts_file, state_file)["to_sim"] == 1
+    assert sim_entries(sim)["ANNA"] == "555999999"
+
+
+def test_sim_edit_is_copied_to_local(open_modem, files):
+    contacts_file, state_file = files
+    sim, at = synced_pair(open_modem, files)
+    index = next(i for i, (_, _, name) in sim.phonebook.items() if name == "BOB")
+    sim.phonebook[index] = ("+995555777777", 145, "BOB")
+    assert sync_phonebook(at, contacts_file, state_file)["to_local"] == 1
+    assert load_contacts(contacts_file)["BOB"] == "+995555777777"
+
+
+def test_local_delete_is_copied_to_sim(open_modem, files):
+    contacts_file, state_file = files
+    sim, at = synced_pair(open_modem, files)
+    write_contacts({"BOB": "+995555222222"}, contacts_file)
+    assert sync_phonebook(at, contacts_file, state_file)["deleted_sim"] == 1
+    assert sim_entries(sim) == {"BOB": "+995555222222"}
+
+
+def test_sim_delete_is_copied_to_local(open_modem, files):
+    contacts_file, state_file = files
+    sim, at = synced_pair(open_modem, files)
+    index = next(i for i, (_, _, name) in sim.phonebook.items() if name == "ANNA")
+    del sim.phonebook[index]
+    assert sync_phonebook(at, contacts_file, state_file)["deleted_local"] == 1
+    assert load_contacts(contacts_file) == {"BOB": "+995555222222"}
+
+
+def test_swapped_sim_is_merged_without_deleting(open_modem, files):
+    contacts_file, state_file = files
+    synced_pair(open_modem, files)
+    new_sim, at = open_modem()
+    new_sim.iccid = "89995098765432109876"
+    stats = sync_phonebook(at, contacts_file, state_file)
+    assert stats["deleted_local"] == 0
+    assert stats["to_sim"] == 2
+    assert load_contacts(contacts_file) == {"ANNA": "555111111", "BOB": "+995555222222"}
+    assert sim_entries(new_sim) == {"ANNA": "555111111", "BOB": "+995555222222"}
+
+
+def test_sim_reading_empty_does_not_wipe_contacts(open_modem, files):
+    contacts_file, state_file = files
+    sim, at = synced_pair(open_modem, files)
+    sim.phonebook.clear()
+    stats = sync_phonebook(at, contacts_file, state_file)
+    assert stats["deleted_local"] == 0
+    assert load_contacts(contacts_file) == {"ANNA": "555111111", "BOB": "+995555222222"}
+    assert sim_entries(sim) == {"ANNA": "555111111", "BOB": "+995555222222"}
+
+
+def test_empty_contact_file_does_not_wipe_sim(open_modem, files):
+    contacts_file, state_file = files
+    sim, at = synced_pair(open_modem, files)
+    write_contacts({}, contacts_file)
+    assert sync_phonebook(at, contacts_file, state_file)["deleted_sim"] == 0
+    assert sim_entries(sim) == {"ANNA": "555111111", "BOB": "+995555222222"}
+    assert load_contacts(contacts_file) == {"ANNA": "555111111", "BOB": "+995555222222"}
@@ -0,0 +1,61 @@
+"""
+ModemPool scheduling across several simulated modems.
+"""
+import pytest
+
+from sim800.pool import ModemPool
+from sim800.simulator import SimulatedModem
+
+
+@pytest.fixture
+def pool_of():
+    """
+    Start `count` SimulatedModems and a ModemPool on their ports.
+    Returns (simulators, pool); everything is stopped after the test.
+    """
+    started = []
+
+    def start(count, **limits):
+        sims = [SimulatedModem(name=f"sim{i}", sms_delay=0.2).start() for i in range(count)]
+        pool = ModemPool([sim.port for sim in sims], baud_rate=115200, **limits)
+        started.append((sims, pool))
+        assert pool.start() == count
+        return sims, pool
+
+    yield start
+    for sims, pool in started:
+        pool.stop()
+        for sim in sims:
+            sim.stop()
+
+
+def test_jobs_are_spread_over_idle_modems(pool_of):
+    sims, pool = pool_of(2)
+    first = pool.send_sms("+995555111111", "one")
+    second = pool.send_sms("+995555222222", "two")
+    assert first.result(timeout=5) and second.result(timeout=5)
+    assert [len(sim.sent_sms) for sim in sims] == [1, 1]
+
+
+def test_rate_limited_job_does_not_hold_up_the_queue(pool_of):
+    sims, pool = pool_of(1, sms_per_minute=1)
+    first = pool.send_sms("+995555111111", "one")
+    second = pool.send_sms("+995555222222", "two")
+    inbox = pool.inbox()
+    call = pool.call("+995555333333", duration=0.1)
+    assert first.result(timeout=5)
+    assert inbox.result(timeout=5) == []
+    assert call.result(timeout=5) == "timeout"
+    assert not second.done()
+    assert sims[0].sent_sms == [("+995555111111", "one")]
+    assert sims[0].dialed == ["+995555333333"]
+
+
+def test_jobs_fail_when_no_modem_is_online():
+    pool = ModemPool(["/dev/nonexistent"], baud_rate=115200)
+    try:
+        assert pool.start() == 0
+        with pytest.raises(RuntimeError, match="No modem online"):
+            pool.send_sms("+995555111111", "one").result(timeout=5)
+    finally:
+        pool.stop()